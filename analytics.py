@@ -0,0 +1,196 @@
+"""Placement analytics for the admin panel.
+
+The data is pulled once as integer/float columns (one query over
+applications, plus the much smaller students and drives tables), grouped
+with NumPy, and cached until the data version changes.
+"""
+import itertools
+import threading
+import time
+import numpy as np
+from flask import current_app
+from sqlalchemy import select, func, case
+from models import db, StudentProfile, CompanyProfile, JobPosting, Application
+from tenancy import cache_key
+from salaries import parse_salary
+
+STATUSES = ['pending', 'reviewed', 'shortlisted', 'rejected', 'accepted']
+CGPA_BINS = np.arange(0, 10.5, 0.5)
+
+REPORTS = {
+    'branches': 'Branch-wise Placement Rate',
+    'companies': 'Offers per Company',
+    'cgpa': 'CGPA Distribution: Accepted vs Rejected',
+    'salary': 'Salary Statistics (Accepted Offers, LPA)',
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def data_version():
+    """Cheap fingerprint that changes whenever the analysed tables change"""
+    return db.session.execute(select(
+        select(func.count(Application.id)).scalar_subquery(),
+        select(func.max(Application.id)).scalar_subquery(),
+        select(func.max(Application.updated_at)).scalar_subquery(),
+        select(func.count(StudentProfile.id)).scalar_subquery(),
+        select(func.max(StudentProfile.updated_at)).scalar_subquery(),
+        select(func.count(JobPosting.id)).scalar_subquery(),
+        select(func.max(JobPosting.id)).scalar_subquery(),
+        select(func.max(JobPosting.updated_at)).scalar_subquery(),
+        select(func.count(CompanyProfile.id)).scalar_subquery(),
+        select(func.max(CompanyProfile.updated_at)).scalar_subquery(),
+    )).one()
+
+
+def get_reports():
+    """All reports as {name: {'title', 'columns', 'rows'}}, cached per tenant and data version"""
+    version = tuple(data_version())
+    ttl = current_app.config['ANALYTICS_CACHE_TTL']
+    key = cache_key('reports')
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == version and time.monotonic() - cached[1] < ttl:
+            return cached[2]
+
+    reports = compute_reports(load_columns())
+    with _cache_lock:
+        _cache[key] = (version, time.monotonic(), reports)
+    return reports
+
+
+def _fetch_raw(statement):
+    """Run a statement on the raw DB-API cursor, skipping per-row Result overhead"""
+    connection = db.session.connection()
+    sql = str(statement.compile(connection, compile_kwargs={'literal_binds': True}))
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(sql)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def load_columns():
+    """Fetch everything the reports need as NumPy arrays"""
+    status_code = case({status: i for i, status in enumerate(STATUSES)}, value=Application.status, else_=-1)
+    applications = _fetch_raw(select(Application.user_id, Application.job_id, status_code))
+    students = db.session.execute(
+        select(StudentProfile.user_id, StudentProfile.branch, StudentProfile.cgpa).order_by(StudentProfile.user_id)
+    ).all()
+    drives = db.session.execute(
+        select(JobPosting.id, JobPosting.company_id, JobPosting.salary).order_by(JobPosting.id)
+    ).all()
+    companies = dict(db.session.execute(select(CompanyProfile.id, CompanyProfile.company_name)).all())
+
+    app_columns = np.fromiter(itertools.chain.from_iterable(applications), dtype=np.int64,
+                              count=3 * len(applications)).reshape(-1, 3)
+    branches = sorted({s.branch for s in students})
+    branch_index = {branch: i for i, branch in enumerate(branches)}
+    company_ids = sorted(companies)
+    company_index = {company_id: i for i, company_id in enumerate(company_ids)}
+
+    return {
+        'app_user': app_columns[:, 0],
+        'app_job': app_columns[:, 1],
+        'app_status': app_columns[:, 2],
+        'student_user': np.array([s.user_id for s in students], dtype=np.int64),
+        'student_branch': np.array([branch_index[s.branch] for s in students], dtype=np.int64),
+        'student_cgpa': np.array([s.cgpa for s in students], dtype=np.float64),
+        'drive_id': np.array([d.id for d in drives], dtype=np.int64),
+        'drive_company': np.array([company_index.get(d.company_id, -1) for d in drives], dtype=np.int64),
+        'drive_salary': np.array([parse_salary(d.salary) or np.nan for d in drives], dtype=np.float64),
+        'branches': branches,
+        'companies': [companies[company_id] for company_id in company_ids],
+    }
+
+
+def _lookup(sorted_keys, keys):
+    """Row index of each key in a sorted key array (-1 when missing)"""
+    positions = np.searchsorted(sorted_keys, keys)
+    positions = np.minimum(positions, max(len(sorted_keys) - 1, 0))
+    found = (sorted_keys[positions] == keys) if len(sorted_keys) else np.zeros(len(keys), dtype=bool)
+    return np.where(found, positions, -1)
+
+
+def _take(values, rows, fill):
+    """values[rows], with fill where rows is -1"""
+    if not len(values):
+        return np.full(len(rows), fill, dtype=np.result_type(values, type(fill)))
+    return np.where(rows >= 0, values[np.maximum(rows, 0)], fill)
+
+
+def compute_reports(c):
+    """All reports from the column arrays, using vectorised grouping"""
+    accepted_code, rejected_code = STATUSES.index('accepted'), STATUSES.index('rejected')
+    shortlisted_code = STATUSES.index('shortlisted')
+    student_row = _lookup(c['student_user'], c['app_user'])
+    drive_row = _lookup(c['drive_id'], c['app_job'])
+    accepted = c['app_status'] == accepted_code
+    rejected = c['app_status'] == rejected_code
+
+    # Branch-wise placement rate: students with at least one accepted offer
+    placed = np.zeros(len(c['student_user']), dtype=bool)
+    placed[student_row[accepted & (student_row >= 0)]] = True
+    n_branches = len(c['branches'])
+    students_per_branch = np.bincount(c['student_branch'], minlength=n_branches)
+    placed_per_branch = np.bincount(c['student_branch'], weights=placed, minlength=n_branches)
+    branch_rows = [
+        (branch, int(total), int(done), round(100 * done / total, 1) if total else 0.0)
+        for branch, total, done in zip(c['branches'], students_per_branch, placed_per_branch)
+    ]
+
+    # Offers per company
+    company = _take(c['drive_company'], drive_row, -1)
+    known = company >= 0
+    n_companies = len(c['companies'])
+    applications_per_company = np.bincount(company[known], minlength=n_companies)
+    shortlisted_per_company = np.bincount(company[known & (c['app_status'] == shortlisted_code)],
+                                          minlength=n_companies)
+    offers_per_company = np.bincount(company[known & accepted], minlength=n_companies)
+    order = np.argsort(-offers_per_company, kind='stable')
+    company_rows = [
+        (c['companies'][i], int(applications_per_company[i]), int(shortlisted_per_company[i]),
+         int(offers_per_company[i]))
+        for i in order
+    ]
+
+    # CGPA distribution of accepted vs rejected applications
+    cgpa = _take(c['student_cgpa'], student_row, np.nan)
+    accepted_hist, _ = np.histogram(cgpa[accepted & (student_row >= 0)], bins=CGPA_BINS)
+    rejected_hist, _ = np.histogram(cgpa[rejected & (student_row >= 0)], bins=CGPA_BINS)
+    cgpa_rows = [
+        (f'{low:.1f} - {high:.1f}', int(a), int(r))
+        for low, high, a, r in zip(CGPA_BINS[:-1], CGPA_BINS[1:], accepted_hist, rejected_hist)
+        if a or r
+    ]
+
+    # Salary statistics over accepted offers, overall and by branch
+    salary = _take(c['drive_salary'], drive_row, np.nan)
+    offered = accepted & ~np.isnan(salary)
+    offer_branch = _take(c['student_branch'], student_row, -1)
+    salary_rows = [_salary_stats('All branches', salary[offered])]
+    for i, branch in enumerate(c['branches']):
+        values = salary[offered & (offer_branch == i)]
+        if len(values):
+            salary_rows.append(_salary_stats(branch, values))
+
+    return {
+        'branches': _report('branches', ['Branch', 'Students', 'Placed', 'Placement Rate (%)'], branch_rows),
+        'companies': _report('companies', ['Company', 'Applications', 'Shortlisted', 'Offers'], company_rows),
+        'cgpa': _report('cgpa', ['CGPA', 'Accepted', 'Rejected'], cgpa_rows),
+        'salary': _report('salary', ['Branch', 'Offers', 'Min', 'Median', 'Mean', '90th pct', 'Max'], salary_rows),
+    }
+
+
+def _salary_stats(label, values):
+    if not len(values):
+        return (label, 0, None, None, None, None, None)
+    p50, p90 = np.percentile(values, [50, 90])
+    return (label, len(values), round(float(values.min()), 2), round(float(p50), 2),
+            round(float(values.mean()), 2), round(float(p90), 2), round(float(values.max()), 2))
+
+
+def _report(name, columns, rows):
+    return {'name': name, 'title': REPORTS[name], 'columns': columns, 'rows': rows}
@@ -0,0 +1,99 @@
+"""Archival of closed placement seasons.
+
+Drives and applications of a finished season are moved from the hot
+job_postings/applications tables into archived_job_postings and
+archived_applications (the 'archive' bind, optionally a separate database).
+Rows are copied and committed to the archive before they are deleted from
+the hot tables, batch by batch, so an interrupted run can simply be re-run.
+"""
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, delete, insert, func
+from models import (db, season_for, CompanyProfile, JobPosting, Application,
+                    ArchivedJobPosting, ArchivedApplication)
+
+APPLICATION_COLUMNS = ['id', 'job_id', 'user_id', 'status', 'applied_at', 'cover_letter']
+
+
+class SeasonStillOpen(Exception):
+    """Raised when archiving a season that still has drives accepting applications"""
+
+
+def backfill_seasons():
+    """Assign a season to drives created before seasons existed"""
+    drives = db.session.execute(
+        select(JobPosting.id, JobPosting.posted_at).filter(JobPosting.season.is_(None))
+    ).all()
+    for drive_id, posted_at in drives:
+        db.session.execute(JobPosting.__table__.update().where(JobPosting.id == drive_id).values(
+            season=season_for(posted_at or datetime.utcnow())))
+    db.session.commit()
+    return len(drives)
+
+
+def season_summary():
+    """(season, drives, applications) for every season still in the hot tables"""
+    return db.session.execute(
+        select(JobPosting.season, func.count(func.distinct(JobPosting.id)), func.count(Application.id))
+        .outerjoin(Application).group_by(JobPosting.season).order_by(JobPosting.season)
+    ).all()
+
+
+def archive_season(season, force=False):
+    """Move every drive of a season, with its applications, into the archive tables"""
+    open_drives = JobPosting.query.filter_by(season=season, is_active=True).filter(
+        JobPosting.deadline >= datetime.now()
+    ).count()
+    if open_drives and not force:
+        raise SeasonStillOpen(f'{open_drives} drive(s) in {season} are still accepting applications.')
+
+    drive_ids = db.session.scalars(select(JobPosting.id).filter_by(season=season)).all()
+    moved = 0
+    for drive_id in drive_ids:
+        moved += archive_drive(drive_id)
+    return len(drive_ids), moved
+
+
+def archive_drive(drive_id):
+    """Copy one drive and its applications to the archive, then remove them from the hot tables"""
+    batch_size = current_app.config['ARCHIVE_BATCH_SIZE']
+
+    if db.session.get(ArchivedJobPosting, drive_id) is None:
+        drive, company_name = db.session.execute(
+            select(JobPosting, CompanyProfile.company_name).join(CompanyProfile)
+            .where(JobPosting.id == drive_id)
+        ).one()
+        db.session.add(ArchivedJobPosting(
+            id=drive.id, company_id=drive.company_id, company_name=company_name,
+            title=drive.title, description=drive.description, requirements=drive.requirements,
+            salary=drive.salary, location=drive.location, job_type=drive.job_type,
+            posted_at=drive.posted_at, deadline=drive.deadline,
+            season=drive.season or season_for(drive.posted_at),
+        ))
+        db.session.commit()
+
+    columns = [getattr(Application, name) for name in APPLICATION_COLUMNS]
+    moved = 0
+    while True:
+        rows = db.session.execute(
+            select(*columns).where(Application.job_id == drive_id).order_by(Application.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+
+        # Archive first (skipping rows a previous, interrupted run already copied) ...
+        archived = set(db.session.scalars(select(ArchivedApplication.id).where(ArchivedApplication.id.in_(ids))))
+        fresh = [dict(zip(APPLICATION_COLUMNS, row)) for row in rows if row.id not in archived]
+        if fresh:
+            db.session.execute(insert(ArchivedApplication), fresh)
+        db.session.commit()
+
+        # ... then drop from the hot table in its own short transaction
+        db.session.execute(delete(Application).where(Application.id.in_(ids)))
+        db.session.commit()
+        moved += len(ids)
+
+    db.session.execute(delete(JobPosting).where(JobPosting.id == drive_id))
+    db.session.commit()
+    return moved
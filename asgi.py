@@ -0,0 +1,314 @@
+"""ASGI entry point for the placement portal.
+
+The I/O-heavy read routes (dashboards and lists) are served by async views
+backed by an async SQLAlchemy session, so a single worker can keep many slow
+queries in flight. Everything else is handed to the regular Flask WSGI app,
+on a pool of ASGI_WSGI_THREADS threads (asgiref's WsgiToAsgi would run every
+such request on one shared thread, one after another).
+
+Run with:  uvicorn asgi:application --workers 2
+"""
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask import g, render_template, session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import selectinload
+from werkzeug.test import EnvironBuilder
+from app import create_app
+from models import db, User, StudentProfile, JobPosting, Application, CompanyProfile
+from replicas import is_pinned_to_primary
+from tenancy import TENANT_BIND_PREFIX, TENANT_ENVIRON_KEY, resolve, load_session_user_id
+import read_models
+from events import AsyncSubscriber, channel_for
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+ASYNC_ROUTES = {}
+EVENTS_PATH = '/events/stream'
+
+
+def async_route(path, role):
+    """Register an async view for a GET path restricted to a role"""
+    def decorator(f):
+        ASYNC_ROUTES[path] = (role, f)
+        return f
+    return decorator
+
+
+def async_url(url):
+    """Translate a sync database URL into its async driver equivalent"""
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+def count(query):
+    return select(func.count()).select_from(query.subquery()).scalar_subquery()
+
+
+@async_route('/admin', 'admin')
+async def admin_panel(s, user, args):
+    """Admin panel statistics in a single round trip"""
+    row = (await s.execute(select(
+        count(select(User.id)),
+        count(select(User.id).filter_by(role='student')),
+        count(select(User.id).filter_by(role='company')),
+        count(select(User.id).filter_by(role='company', is_approved=True)),
+        count(select(User.id).filter_by(role='company', is_approved=False)),
+        count(select(JobPosting.id)),
+        count(select(JobPosting.id).filter_by(is_approved=True)),
+        count(select(JobPosting.id).filter_by(is_approved=False)),
+        count(select(Application.id)),
+    ))).one()
+    keys = ['total_users', 'total_students', 'total_companies', 'approved_companies',
+            'pending_companies', 'total_drives', 'approved_drives', 'pending_drives',
+            'total_applications']
+    return render_template('admin.html', stats=dict(zip(keys, row)))
+
+
+@async_route('/admin/applications', 'admin')
+async def admin_applications(s, user, args):
+    """All applications as read-model rows"""
+    result = await s.execute(read_models.applications_query())
+    applications = [read_models.ApplicationRow._make(row) for row in result.tuples()]
+    return render_template('admin_applications.html', applications=applications)
+
+
+@async_route('/admin/students', 'admin')
+async def admin_students(s, user, args):
+    """All students, optionally filtered by search"""
+    search = args.get('search', '')
+    result = await s.execute(read_models.students_query(search))
+    students = [read_models.StudentRow._make(row) for row in result.tuples()]
+    return render_template('admin_students.html', students=students, search=search)
+
+
+@async_route('/student/dashboard', 'student')
+async def student_dashboard(s, user, args):
+    """Student dashboard statistics in a single round trip"""
+    profile = await s.scalar(select(StudentProfile).filter_by(user_id=user.id))
+    stats = dict.fromkeys(['total_applications', 'pending_applications', 'shortlisted_applications',
+                           'accepted_applications', 'available_drives'], 0)
+    if profile:
+        mine = select(Application.id).filter_by(user_id=user.id)
+        row = (await s.execute(select(
+            count(mine),
+            count(mine.filter_by(status='pending')),
+            count(mine.filter_by(status='shortlisted')),
+            count(mine.filter_by(status='accepted')),
+            count(select(JobPosting.id).filter_by(is_active=True, is_approved=True).filter(
+                JobPosting.deadline >= datetime.now())),
+        ))).one()
+        stats = dict(zip(stats, row))
+    return render_template('student_dashboard.html', profile=profile, stats=stats)
+
+
+@async_route('/student/applications', 'student')
+async def my_applications(s, user, args):
+    """Student's applications with drive and company preloaded"""
+    profile = await s.scalar(select(StudentProfile).filter_by(user_id=user.id))
+    applications = (await s.scalars(
+        select(Application).filter_by(user_id=user.id)
+        .options(selectinload(Application.job).selectinload(JobPosting.company))
+        .order_by(Application.applied_at.desc())
+    )).all()
+    return render_template('my_applications.html', profile=profile, applications=applications)
+
+
+@async_route('/company/dashboard', 'company')
+async def company_dashboard(s, user, args):
+    """Company dashboard statistics in a single round trip"""
+    profile = await s.scalar(select(CompanyProfile).filter_by(user_id=user.id))
+    stats = dict.fromkeys(['total_drives', 'active_drives', 'approved_drives', 'pending_drives',
+                           'total_applications', 'pending_applications', 'shortlisted_applications'], 0)
+    if profile:
+        drives = select(JobPosting.id).filter_by(company_id=profile.id)
+        received = select(Application.id).join(JobPosting).filter(JobPosting.company_id == profile.id)
+        row = (await s.execute(select(
+            count(drives),
+            count(drives.filter_by(is_active=True)),
+            count(drives.filter_by(is_approved=True)),
+            count(drives.filter_by(is_approved=False)),
+            count(received),
+            count(received.filter(Application.status == 'pending')),
+            count(received.filter(Application.status == 'shortlisted')),
+        ))).one()
+        stats = dict(zip(stats, row))
+    return render_template('company_dashboard.html', profile=profile, stats=stats)
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi that runs requests concurrently on a bounded thread pool"""
+
+    def __init__(self, wsgi_application, threads):
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        await _PooledInstance(self.wsgi_application, self.executor, self.duplicate_header_limit)(scope, receive, send)
+
+
+class _PooledInstance(WsgiToAsgiInstance):
+    # The undecorated body of asgiref's run_wsgi_app, which is thread_sensitive
+    run_wsgi_app_sync = WsgiToAsgiInstance.__dict__['run_wsgi_app'].func
+
+    def __init__(self, wsgi_application, executor, duplicate_header_limit=100):
+        super().__init__(wsgi_application, duplicate_header_limit)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(self.run_wsgi_app_sync, thread_sensitive=False, executor=self.executor)(body)
+
+
+class PortalASGI:
+    """Serves ASYNC_ROUTES natively and falls back to the WSGI app for the rest"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = PooledWsgiToAsgi(flask_app, flask_app.config['ASGI_WSGI_THREADS'])
+        with flask_app.app_context():
+            engines = db.engines
+            self.primary = async_sessionmaker(create_async_engine(async_url(engines[None].url)),
+                                              expire_on_commit=False)
+            self.replicas = [async_sessionmaker(create_async_engine(async_url(engine.url)),
+                                                expire_on_commit=False)
+                             for key, engine in engines.items() if key and key.startswith('replica_')]
+            self.tenants = {slug: async_sessionmaker(create_async_engine(async_url(
+                                engines[f'{TENANT_BIND_PREFIX}{slug}'].url)), expire_on_commit=False)
+                            for slug in flask_app.config['TENANTS']}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            tenant, prefix = None, ''
+            if self.tenants:
+                host = dict(scope['headers']).get(b'host', b'').decode('latin-1')
+                tenant, prefix = resolve(self.tenants, host, scope['path'],
+                                         self.flask_app.config['DEFAULT_TENANT'])
+            path = scope['path'][len(prefix):] or '/'
+            known_tenant = tenant or not self.tenants
+            if path == EVENTS_PATH and known_tenant and await self.stream_events(scope, receive, send, tenant, prefix):
+                return
+            route = ASYNC_ROUTES.get(path)
+            if route and known_tenant and await self.serve(route, scope, send, tenant, prefix):
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for maker in [self.primary] + self.replicas + list(self.tenants.values()):
+                    await maker.kw['bind'].dispose()
+                self.wsgi.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def serve(self, route, scope, send, tenant=None, prefix=''):
+        """Run an async view; returns False to let the WSGI app handle the request"""
+        role, view = route
+        ctx = self.flask_app.request_context(self.environ(scope, tenant, prefix))
+        ctx.push()
+        try:
+            user_id = load_session_user_id(session.get('_user_id', ''))
+            if user_id is None:
+                return False  # Login redirects and remember-me cookies stay on the WSGI path
+
+            if tenant:
+                maker = self.tenants[tenant]
+            elif self.replicas and not is_pinned_to_primary():
+                maker = random.choice(self.replicas)
+            else:
+                maker = self.primary
+            async with maker() as s:
+                user = await s.get(User, user_id)
+                if user is None or user.role != role:
+                    return False
+                g._login_user = user
+                body = await view(s, user, ctx.request.args)
+
+            response = self.flask_app.process_response(self.flask_app.make_response(body))
+        finally:
+            ctx.pop()
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                        for k, v in response.headers.to_wsgi_list()],
+        })
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+        return True
+
+    async def stream_events(self, scope, receive, send, tenant=None, prefix=''):
+        """Hold a server-sent events connection as a parked coroutine; returns False to let the WSGI app answer"""
+        ctx = self.flask_app.request_context(self.environ(scope, tenant, prefix))
+        ctx.push()
+        try:
+            user_id = load_session_user_id(session.get('_user_id', ''))
+        finally:
+            ctx.pop()
+        if user_id is None:
+            return False
+        async with (self.tenants[tenant] if tenant else self.primary)() as s:
+            if await s.get(User, user_id) is None:
+                return False
+
+        broker = self.flask_app.extensions['events']
+        subscriber = broker.subscribe(AsyncSubscriber(channel_for(user_id, tenant)))
+        heartbeat = self.flask_app.config['EVENTS_HEARTBEAT']
+        disconnected = asyncio.ensure_future(self.disconnected(receive))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-type', b'text/event-stream; charset=utf-8'),
+                            (b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no')],
+            })
+            message = 'retry: 5000\n\n'
+            while True:
+                await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+                arrived = asyncio.ensure_future(subscriber.get(heartbeat))
+                await asyncio.wait([arrived, disconnected], return_when=asyncio.FIRST_COMPLETED)
+                if disconnected.done():
+                    arrived.cancel()
+                    break
+                message = arrived.result() or ': keep-alive\n\n'
+        finally:
+            disconnected.cancel()
+            broker.unsubscribe(subscriber)
+        return True
+
+    @staticmethod
+    async def disconnected(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    def environ(scope, tenant=None, prefix=''):
+        headers = [(k.decode('latin-1'), v.decode('latin-1')) for k, v in scope['headers']]
+        host = dict(headers).get('host', 'localhost')
+        builder = EnvironBuilder(
+            path=scope['path'][len(prefix):] or '/',
+            base_url=f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}{prefix}",
+            query_string=scope['query_string'].decode('latin-1'),
+            headers=headers,
+            environ_base={'REMOTE_ADDR': (scope.get('client') or ('', 0))[0], TENANT_ENVIRON_KEY: tenant},
+        )
+        try:
+            return builder.get_environ()
+        finally:
+            builder.close()
+
+
+application = PortalASGI(create_app())
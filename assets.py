@@ -0,0 +1,145 @@
+"""Fingerprinted, precompressed static assets.
+
+build() copies every file under static/ into static/dist/ with a content
+hash in its name (css/style.css -> css/style.<hash>.css), writes gzip and,
+when the optional brotli package is installed, brotli variants next to it,
+and records both in static/dist/manifest.json. Templates link assets with
+asset_url(), which points at the hashed copy under /assets/ once a manifest
+exists and falls back to /static/ otherwise. Hashed files from earlier builds
+stay in static/dist/ and are still served, so pages rendered before a deploy
+keep their styles and scripts. A hashed name never changes
+content, so /assets/ responses are cached for a year as immutable and the
+variant matching the browser's Accept-Encoding is sent as is, without
+compressing anything per request.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from flask import abort, current_app, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+
+DIST = 'dist'
+MANIFEST = 'manifest.json'
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.map', '.xml', '.html')
+MIN_COMPRESS_SIZE = 256  # Smaller files don't shrink enough to be worth a variant
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}  # In order of preference
+
+
+def load_brotli():
+    """The optional brotli module, or None when it is not installed"""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def fingerprint(name, data):
+    """Hashed file name of an asset, e.g. css/style.3f2a9c81d0.css"""
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}'
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build(static_folder):
+    """Fingerprint and precompress every static asset; returns {name: (hashed name, {encoding: size})}"""
+    dist = os.path.join(static_folder, DIST)
+    brotli = load_brotli()
+    manifest, built = {}, {}
+    for root, dirs, files in os.walk(static_folder):
+        if root == static_folder and DIST in dirs:
+            dirs.remove(DIST)
+        for file in sorted(files):
+            source = os.path.join(root, file)
+            name = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+            hashed = fingerprint(name, data)
+            target = os.path.join(dist, hashed)
+            _write(target, data)
+
+            sizes = {'identity': len(data)}
+            if name.endswith(COMPRESSIBLE) and len(data) >= MIN_COMPRESS_SIZE:
+                variants = {'gzip': gzip.compress(data, 9, mtime=0)}
+                if brotli is not None:
+                    variants['br'] = brotli.compress(data, quality=11)
+                for encoding, compressed in variants.items():
+                    if len(compressed) < len(data):
+                        _write(target + SUFFIXES[encoding], compressed)
+                        sizes[encoding] = len(compressed)
+            manifest[name] = {'path': hashed, 'encodings': [e for e in SUFFIXES if e in sizes]}
+            built[name] = (hashed, sizes)
+
+    # Files from earlier builds stay in place for pages still referencing them; only the manifest is swapped
+    path = os.path.join(dist, MANIFEST)
+    _write(path + '.tmp', json.dumps(manifest, indent=2, sort_keys=True).encode())
+    os.replace(path + '.tmp', path)
+    return built
+
+
+def load_manifest(static_folder):
+    """The manifest written by build(), or {} if assets haven't been built"""
+    try:
+        with open(os.path.join(static_folder, DIST, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def asset_url(filename):
+    """URL of a static asset: its fingerprinted copy once built, the plain static file otherwise"""
+    entry = current_app.extensions['assets']['manifest'].get(filename)
+    if entry is None:
+        return url_for('static', filename=filename)
+    return url_for('assets', filename=entry['path'])
+
+
+def _encodings(filename):
+    """Precompressed variants of a fingerprinted asset, or None if there is no such asset"""
+    encodings = current_app.extensions['assets']['encodings'].get(filename)
+    if encodings is not None:
+        return encodings
+    # A file from an earlier build, still linked by pages rendered before the deploy
+    path = safe_join(os.path.join(current_app.static_folder, DIST), filename)
+    if path is None or filename == MANIFEST or filename.endswith(tuple(SUFFIXES.values())) \
+            or not os.path.isfile(path):
+        return None
+    return [e for e, suffix in SUFFIXES.items() if os.path.isfile(path + suffix)]
+
+
+def serve_asset(filename):
+    """Send a fingerprinted asset from this or an earlier build, precompressed when the client accepts it"""
+    encodings = _encodings(filename)
+    if encodings is None:
+        abort(404)
+    accepted = [e for e in encodings if request.accept_encodings[e]]
+    encoding = max(accepted, key=lambda e: request.accept_encodings[e], default=None)
+    response = send_from_directory(
+        os.path.join(current_app.static_folder, DIST),
+        filename + SUFFIXES[encoding] if encoding else filename,
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        max_age=current_app.config['ASSETS_MAX_AGE'],
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    """Load the asset manifest and serve fingerprinted assets under /assets/"""
+    manifest = load_manifest(app.static_folder)
+    app.extensions['assets'] = {
+        'manifest': manifest,
+        'encodings': {entry['path']: entry['encodings'] for entry in manifest.values()},
+    }
+    app.add_url_rule('/assets/<path:filename>', 'assets', serve_asset)
+    app.add_template_global(asset_url)
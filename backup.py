@@ -0,0 +1,255 @@
+"""Online backups of the portal database, and restores into a fresh one.
+
+SQLite databases are copied with the online backup API, BACKUP_PAGES pages
+per step with a short pause between steps, so the copy never holds a lock
+for long. In WAL mode the copy reads one snapshot pinned for its whole
+duration: writers carry on untouched and the copy never restarts. In the
+default rollback-journal mode every commit by another connection restarts
+the copy, so after BACKUP_MAX_RESTARTS the remainder is taken in a single
+step (writers wait for that copy). The snapshot is checked with
+PRAGMA integrity_check and then streamed through gzip.
+
+PostgreSQL databases are streamed from pg_dump (a consistent snapshot that
+doesn't block writers) straight through gzip, without a temporary copy.
+
+Every backup gets a .sha256 file next to it. A backup is verified against it
+after being written and again before it is restored.
+"""
+import gzip
+import hashlib
+import os
+import pathlib
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import URL
+
+CHUNK = 1024 * 1024
+EXTENSIONS = {'sqlite': '.db.gz', 'postgresql': '.sql.gz'}
+
+BackupResult = namedtuple('BackupResult', 'path size compressed seconds copy_seconds steps restarts')
+
+
+class BackupError(Exception):
+    """Raised when a backup can't be taken, verified or restored"""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+class _HashingWriter:
+    """File wrapper that hashes and counts what is written through it"""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+
+def backup_path(directory, label, url):
+    """File name for a new backup, e.g. backups/portal-20250301-020000.db.gz"""
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return os.path.join(directory, f'{label}-{stamp}{EXTENSIONS[_dialect(url)]}')
+
+
+def _dialect(url):
+    dialect = url.get_backend_name()
+    if dialect not in EXTENSIONS:
+        raise BackupError(f'Backups are only supported for SQLite and PostgreSQL, not {dialect}.')
+    return dialect
+
+
+def backup(url, path):
+    """Back up the database at a SQLAlchemy URL into a gzipped file; returns a BackupResult"""
+    started = time.perf_counter()
+    partial = path + '.partial'
+    try:
+        with open(partial, 'wb') as f:
+            out = _HashingWriter(f)
+            if _dialect(url) == 'sqlite':
+                size, copy_seconds, steps, restarts = _backup_sqlite(url.database, out)
+            else:
+                size = _backup_postgresql(url, out)
+                copy_seconds, steps, restarts = time.perf_counter() - started, 0, 0
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    with open(path + '.sha256', 'w') as f:
+        f.write(f'{out.sha256.hexdigest()}  {os.path.basename(path)}\n')
+    verify(path)
+    return BackupResult(path, size, out.size, time.perf_counter() - started, copy_seconds, steps, restarts)
+
+
+def _backup_sqlite(database, out):
+    """Snapshot a SQLite file next to the backup, check it and gzip it into out"""
+    config = current_app.config
+    # Read-only, so a mistyped path fails instead of creating (and backing up) an empty database
+    if not database or not os.path.isfile(database):
+        raise BackupError(f'{database or "An in-memory database"} does not exist; nothing to back up.')
+    source = sqlite3.connect(f'{pathlib.Path(database).resolve().as_uri()}?mode=ro', uri=True, isolation_level=None)
+    snapshot = tempfile.NamedTemporaryFile(suffix='.db', dir=os.path.dirname(out.f.name) or '.', delete=False)
+    snapshot.close()
+    target = sqlite3.connect(snapshot.name)
+    try:
+        wal = source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        if wal:
+            # Pin one snapshot for every step: readers never block WAL writers
+            source.execute('BEGIN')
+            source.execute('SELECT count(*) FROM sqlite_master').fetchone()
+        progress = {'steps': 0, 'restarts': 0, 'remaining': None}
+        started = time.perf_counter()
+
+        def step(status, remaining, total):
+            progress['steps'] += 1
+            if progress['remaining'] is not None and remaining > progress['remaining']:
+                progress['restarts'] += 1
+                if progress['restarts'] > config['BACKUP_MAX_RESTARTS']:
+                    raise _TooManyRestarts()
+            progress['remaining'] = remaining
+            time.sleep(config['BACKUP_STEP_PAUSE'])  # Outside the step, so writers get the lock
+
+        try:
+            source.backup(target, pages=config['BACKUP_PAGES'], progress=step)
+        except _TooManyRestarts:
+            source.backup(target, pages=-1)
+            progress['steps'] += 1
+        if wal:
+            source.execute('COMMIT')
+        copy_seconds = time.perf_counter() - started
+
+        result = target.execute('PRAGMA integrity_check').fetchone()[0]
+        if result != 'ok':
+            raise BackupError(f'Integrity check of the snapshot of {database} failed: {result}')
+        target.close()
+        size = os.path.getsize(snapshot.name)
+        with open(snapshot.name, 'rb') as src, \
+                gzip.GzipFile(fileobj=out, mode='wb', compresslevel=config['BACKUP_COMPRESS_LEVEL'], mtime=0) as gz:
+            shutil.copyfileobj(src, gz, CHUNK)
+        return size, copy_seconds, progress['steps'], progress['restarts']
+    finally:
+        source.close()
+        target.close()
+        os.remove(snapshot.name)
+
+
+def _pg_command(tool, url, *args):
+    """Command line and environment for a PostgreSQL client tool; the password goes in the environment"""
+    env = dict(os.environ)
+    if url.password:
+        env['PGPASSWORD'] = url.password
+    dbname = URL.create('postgresql', username=url.username, host=url.host, port=url.port,
+                        database=url.database, query=url.query).render_as_string()
+    return [tool, *args, f'--dbname={dbname}'], env
+
+
+def _run_streaming(command, env, stdin=None, stdout=None):
+    """Start a client tool; returns the process and the file collecting its stderr"""
+    errors = tempfile.TemporaryFile()
+    try:
+        return subprocess.Popen(command, env=env, stdin=stdin, stdout=stdout, stderr=errors), errors
+    except FileNotFoundError as e:
+        errors.close()
+        raise BackupError(f'{command[0]} is required to back up and restore PostgreSQL databases.') from e
+
+
+def _check(process, errors):
+    with errors:
+        if process.wait() != 0:
+            errors.seek(0)
+            raise BackupError(f'{process.args[0]} failed: {errors.read().decode(errors="replace").strip()}')
+
+
+def _backup_postgresql(url, out):
+    """Stream pg_dump through gzip into out; returns the uncompressed size"""
+    command, env = _pg_command('pg_dump', url, '--no-owner', '--no-privileges')
+    process, errors = _run_streaming(command, env, stdout=subprocess.PIPE)
+    size = 0
+    with gzip.GzipFile(fileobj=out, mode='wb',
+                       compresslevel=current_app.config['BACKUP_COMPRESS_LEVEL'], mtime=0) as gz:
+        while chunk := process.stdout.read(CHUNK):
+            gz.write(chunk)
+            size += len(chunk)
+    _check(process, errors)
+    return size
+
+
+def verify(path):
+    """Check a backup against its .sha256 file and decompress it end to end; returns its uncompressed size"""
+    try:
+        with open(path + '.sha256') as f:
+            expected = f.read().split()[0]
+    except FileNotFoundError as e:
+        raise BackupError(f'{path}.sha256 is missing; the backup cannot be verified.') from e
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK):
+            sha256.update(chunk)
+    if sha256.hexdigest() != expected:
+        raise BackupError(f'{path} does not match its checksum.')
+    size = 0
+    try:
+        with gzip.open(path, 'rb') as gz:
+            while chunk := gz.read(CHUNK):
+                size += len(chunk)
+    except (OSError, EOFError) as e:
+        raise BackupError(f'{path} is not a complete gzip stream: {e}') from e
+    return size
+
+
+def restore(path, url):
+    """Verify a backup and restore it into a fresh database at a SQLAlchemy URL"""
+    verify(path)
+    if _dialect(url) == 'sqlite':
+        _restore_sqlite(path, url.database)
+    else:
+        _restore_postgresql(path, url)
+
+
+def _restore_sqlite(path, database):
+    if os.path.exists(database):
+        raise BackupError(f'{database} already exists; restore into a new file.')
+    partial = database + '.partial'
+    try:
+        with gzip.open(path, 'rb') as gz, open(partial, 'wb') as f:
+            shutil.copyfileobj(gz, f, CHUNK)
+        conn = sqlite3.connect(partial)
+        try:
+            result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+        finally:
+            conn.close()
+        if result != 'ok':
+            raise BackupError(f'Integrity check of the restored database failed: {result}')
+        os.replace(partial, database)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def _restore_postgresql(path, url):
+    # One transaction that stops at the first error, so a failed restore leaves the database empty
+    command, env = _pg_command('psql', url, '--quiet', '--no-psqlrc', '--single-transaction',
+                               '--set=ON_ERROR_STOP=1')
+    process, errors = _run_streaming(command, env, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL)
+    try:
+        with gzip.open(path, 'rb') as gz:
+            shutil.copyfileobj(gz, process.stdin, CHUNK)
+    except BrokenPipeError:
+        pass  # psql stopped early; its exit status says why
+    finally:
+        process.stdin.close()
+    _check(process, errors)
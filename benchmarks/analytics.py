@@ -0,0 +1,45 @@
+"""Time the analytics reports on a large synthetic dataset.
+
+    python benchmarks/analytics.py --applications 1000000
+"""
+import argparse
+import time
+
+from seed import use_temp_database, seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=1000000)
+    parser.add_argument('--students', type=int, default=50000)
+    parser.add_argument('--drives', type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app import create_app
+    from models import db
+    app = create_app()
+    import analytics
+
+    with app.app_context():
+        started = time.perf_counter()
+        seed(db, students=args.students, drives=args.drives, companies=200, applications=args.applications)
+        print(f'seeded {args.applications} applications in {time.perf_counter() - started:.1f}s')
+
+        started = time.perf_counter()
+        columns = analytics.load_columns()
+        loaded = time.perf_counter() - started
+        started = time.perf_counter()
+        analytics.compute_reports(columns)
+        computed = time.perf_counter() - started
+        print(f'load columns   {loaded * 1000:9.1f} ms')
+        print(f'compute        {computed * 1000:9.1f} ms')
+
+        for label in ('cold request', 'cached request'):
+            started = time.perf_counter()
+            analytics.get_reports()
+            print(f'{label:<15}{(time.perf_counter() - started) * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
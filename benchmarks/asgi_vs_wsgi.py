@@ -0,0 +1,126 @@
+"""Compare throughput of the WSGI app and the ASGI entry point.
+
+    python benchmarks/asgi_vs_wsgi.py --path /admin --requests 2000 --concurrency 64
+    python benchmarks/asgi_vs_wsgi.py --path /admin/drives --requests 500 --concurrency 16
+
+/admin is an async view under asgi.py; /admin/drives is a sync route it hands
+to the Flask app. The asgi-1 row runs those on a single thread, the way
+asgiref's stock WsgiToAsgi does.
+"""
+import argparse
+import asyncio
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from seed import ROOT, use_temp_database, seed
+
+UVICORN = [sys.executable, '-m', 'uvicorn', 'asgi:application', '--port', '{port}', '--log-level', 'warning']
+SERVERS = {
+    'wsgi': ([sys.executable, '-c',
+             'import logging; logging.getLogger("werkzeug").setLevel(logging.ERROR); '
+             'from werkzeug.serving import run_simple; from app import create_app; '
+             'run_simple("127.0.0.1", {port}, create_app(), threaded=True)'], {}),
+    'asgi': (UVICORN, {}),
+    'asgi-1': (UVICORN, {'ASGI_WSGI_THREADS': '1'}),
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+def login(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('POST', '/login', 'username=admin&password=admin123',
+                 {'Content-Type': 'application/x-www-form-urlencoded'})
+    response = conn.getresponse()
+    response.read()
+    return response.getheader('Set-Cookie').split(';')[0]
+
+
+async def fetch(port, path, cookie):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n'
+                 f'Connection: close\r\n\r\n'.encode())
+    await writer.drain()
+    status = (await reader.readline()).split()[1]
+    await reader.read()
+    writer.close()
+    return int(status)
+
+
+async def load(port, path, cookie, requests, concurrency):
+    latencies, errors = [], 0
+    queue = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in queue:
+            started = time.perf_counter()
+            if await fetch(port, path, cookie) != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--path', default='/admin')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--applications', type=int, default=20000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from models import db, User
+    app = create_app()
+    with app.app_context():
+        seed(db, applications=args.applications)
+        db.session.add(User(username='admin', email='admin@example.com', role='admin',
+                            password_hash=generate_password_hash('admin123'), is_approved=True))
+        db.session.commit()
+
+    print(f'{"mode":<6}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"errors":>8}')
+    for mode, (command, env) in SERVERS.items():
+        port = free_port()
+        command = [part.format(port=port) for part in command]
+        server = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env})
+        try:
+            wait_for(port)
+            cookie = login(port)
+            elapsed, latencies, errors = asyncio.run(
+                load(port, args.path, cookie, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        latencies.sort()
+        print(f'{mode:<6}{args.requests / elapsed:>10.1f}'
+              f'{statistics.median(latencies) * 1000:>10.1f}'
+              f'{latencies[int(len(latencies) * 0.95)] * 1000:>10.1f}{errors:>8}')
+
+
+if __name__ == '__main__':
+    main()
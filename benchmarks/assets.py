@@ -0,0 +1,61 @@
+"""Bytes sent per page view with plain vs fingerprinted, precompressed assets and gzip.
+
+    python benchmarks/assets.py --applications 20000
+"""
+import argparse
+import gzip
+import re
+import time
+
+from seed import use_temp_database, seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from models import db, User
+    import assets
+    built = assets.build(create_app().static_folder)
+    app = create_app()  # Loads the manifest just written
+
+    with app.app_context():
+        seed(db, students=2000, drives=200, companies=20, applications=args.applications)
+        db.session.add(User(username='admin', email='admin@example.com', role='admin', is_active=True,
+                            is_approved=True, password_hash=generate_password_hash('admin123')))
+        db.session.commit()
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+    print('static assets (bytes)')
+    print(f'{"":<14}{"identity":>10}{"gzip":>10}{"br":>10}')
+    totals = {'identity': 0, 'gzip': 0, 'br': 0}
+    for name, (hashed, sizes) in built.items():
+        for encoding in totals:
+            totals[encoding] += sizes.get(encoding, sizes['identity'])
+        print(f'{name:<14}' + ''.join(f'{sizes.get(e, sizes["identity"]):>10,}' for e in totals))
+    print(f'{"total":<14}' + ''.join(f'{totals[e]:>10,}' for e in totals))
+    page = client.get('/admin/applications', headers={'Accept-Encoding': 'gzip'})
+    hashed_urls = re.findall(r'"(/assets/[^"]+)"', gzip.decompress(page.data).decode())
+    for url in [f'/static/{name}' for name in built] + hashed_urls:
+        response = client.get(url)
+        print(f'{url:<40} Cache-Control: {response.headers.get("Cache-Control")}')
+        response.close()
+
+    print('\n/admin/applications')
+    print(f'{"":<12}{"bytes":>12}{"ms":>8}')
+    for label, encoding in (('identity', ''), ('gzip', 'gzip')):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            response = client.get('/admin/applications', headers={'Accept-Encoding': encoding})
+        elapsed = (time.perf_counter() - started) / args.repeat
+        print(f'{label:<12}{len(response.data):>12,}{elapsed * 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Online backup throughput, and how much it stalls a concurrent writer.
+
+    python benchmarks/backup.py --applications 300000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from seed import use_temp_database, seed
+
+
+class Writer(threading.Thread):
+    """Commits small status updates back to back and records how long each one took"""
+
+    def __init__(self, path, applications):
+        super().__init__(daemon=True)
+        self.path = path
+        self.applications = applications
+        self.latencies = []
+        self.running = True
+
+    def run(self):
+        conn = sqlite3.connect(self.path, timeout=60)
+        rng = random.Random(1)
+        while self.running:
+            started = time.perf_counter()
+            conn.execute('UPDATE applications SET status = ? WHERE id = ?',
+                         (rng.choice(['pending', 'reviewed']), rng.randint(1, self.applications)))
+            conn.commit()
+            self.latencies.append(time.perf_counter() - started)
+            time.sleep(0.002)
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=300000)
+    args = parser.parse_args()
+
+    path = use_temp_database()
+    from app import create_app
+    from models import db
+    import backup
+    app = create_app()
+    out = tempfile.mkdtemp(prefix='portal-backups-')
+
+    with app.app_context():
+        seed(db, students=5000, drives=500, companies=50, applications=args.applications)
+        url = db.engine.url
+        db.engine.dispose()
+    print(f'database: {os.path.getsize(path) / 2 ** 20:.0f} MB')
+    print(f'{"journal":<9}{"pages/step":>11}{"copy s":>8}{"total s":>9}{"MB/s":>7}{"restarts":>10}'
+          f'{"writes/s":>10}{"p99 write ms":>14}{"max write ms":>14}')
+    for journal, pages in (('delete', None), ('delete', -1), ('delete', 1024),
+                           ('wal', None), ('wal', -1), ('wal', 1024)):
+        conn = sqlite3.connect(path)
+        conn.execute(f'PRAGMA journal_mode={journal}')
+        conn.close()
+        writer = Writer(path, args.applications)
+        writer.start()
+        time.sleep(0.5)
+        writes_before = len(writer.latencies)
+        if pages is None:
+            # The writer on its own, for comparison
+            time.sleep(3)
+            result = None
+            seconds = 3
+        else:
+            app.config['BACKUP_PAGES'] = pages
+            with app.app_context():
+                result = backup.backup(url, backup.backup_path(out, f'{journal}{pages}', url))
+            seconds = result.seconds
+        writer.running = False
+        writer.join()
+        latencies = sorted(writer.latencies[writes_before:])
+        p99, worst = latencies[int(len(latencies) * 0.99)], latencies[-1]
+        if result is None:
+            print(f'{journal:<9}{"no backup":>11}{"":>8}{"":>9}{"":>7}{"":>10}', end='')
+        else:
+            print(f'{journal:<9}{pages:>11}{result.copy_seconds:>8.2f}{result.seconds:>9.2f}'
+                  f'{result.size / 2 ** 20 / result.seconds:>7.0f}{result.restarts:>10}', end='')
+        print(f'{len(latencies) / seconds:>10.0f}{p99 * 1000:>14.1f}{worst * 1000:>14.1f}')
+    print(f'compressed: {result.compressed / 2 ** 20:.1f} MB ({result.size / result.compressed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
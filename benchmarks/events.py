@@ -0,0 +1,82 @@
+"""Hold many idle live-update connections on the ASGI app and time a fan-out.
+
+    python benchmarks/events.py --connections 5000
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from seed import use_temp_database, seed
+
+
+async def main_async(args):
+    from app import create_app
+    from models import db
+    app = create_app()
+    import events
+    from asgi import application
+
+    with app.app_context():
+        seed(db, students=args.connections, drives=1, companies=1, applications=0)
+    signer = app.session_interface.get_signing_serializer(app)
+    broker = app.extensions['events']
+    received = asyncio.Queue()
+    hangups = []
+
+    async def connect(user_id):
+        cookie = signer.dumps({'_user_id': str(user_id)})
+        hangup = asyncio.Event()
+        hangups.append(hangup)
+
+        async def receive():
+            await hangup.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message.get('body', b'').startswith(b'event:'):
+                received.put_nowait(time.perf_counter())
+
+        scope = {'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+                 'path': '/events/stream', 'query_string': b'', 'root_path': '', 'server': ('bench', 80),
+                 'client': ('127.0.0.1', 0), 'headers': [(b'host', b'bench'), (b'cookie', f'session={cookie}'.encode())]}
+        await application(scope, receive, send)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(connect(user_id)) for user_id in range(1, args.connections + 1)]
+    while broker.connections() < args.connections:
+        await asyncio.sleep(0.05)
+    opened = time.perf_counter() - started
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'connections    {broker.connections():>9}')
+    print(f'open all       {opened * 1000:9.0f} ms')
+    print(f'memory/conn    {(after - before) / args.connections / 1024:9.1f} KiB')
+
+    with app.app_context():
+        started = time.perf_counter()
+        for user_id in range(1, args.connections + 1):
+            events.publish(user_id, 'counts', {'pending_applications': 1})
+        published = time.perf_counter() - started
+    arrivals = [await received.get() for _ in range(args.connections)]
+    print(f'publish all    {published * 1000:9.0f} ms')
+    print(f'all delivered  {(max(arrivals) - started) * 1000:9.0f} ms')
+
+    for hangup in hangups:
+        hangup.set()
+    await asyncio.gather(*tasks)
+    print(f'after hangup   {broker.connections():>9}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=5000)
+    args = parser.parse_args()
+    use_temp_database()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
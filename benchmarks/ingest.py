@@ -0,0 +1,77 @@
+"""Applications per second: one commit per request vs group commit.
+
+    python benchmarks/ingest.py --applications 4000 --workers 3 --threads 2
+
+--workers and --threads mirror gunicorn.conf.py (forked workers, each with
+its own writer thread); the defaults are what it ships with on this machine.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from seed import use_temp_database, seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=4000)
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY',
+                                                                           multiprocessing.cpu_count() * 2 + 1)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 2)))
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app import create_app
+    from models import db, Application
+    import ingest
+    app = create_app()
+
+    students = args.applications
+    with app.app_context():
+        seed(db, students=students, drives=3, companies=1, applications=0)
+        db.engine.dispose()
+
+    def per_request(user_id, job_id):
+        # What apply_to_drive did before: check, insert and commit on its own
+        with app.app_context():
+            if not Application.query.filter_by(user_id=user_id, job_id=job_id).first():
+                db.session.add(Application(job_id=job_id, user_id=user_id, status='pending', cover_letter=''))
+                db.session.commit()
+
+    def direct(user_id, job_id):
+        # INGEST_ENABLED=0: the same checks as a batch, committed by the request
+        with app.app_context():
+            ingest.write_batch([ingest.Submission(user_id, job_id, '')])
+
+    def group_commit(user_id, job_id):
+        with app.app_context():
+            ingest.submit_application(user_id, job_id, '')
+
+    def worker(apply, job_id, user_ids):
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(apply, user_ids, [job_id] * len(user_ids)))
+
+    fork = multiprocessing.get_context('fork')
+    print(f'{args.workers} workers x {args.threads} threads')
+    print(f'{"":<14}{"apps/sec":>10}{"seconds":>10}')
+    for job_id, (label, apply) in enumerate((('per-request', per_request), ('direct', direct),
+                                             ('group commit', group_commit)), start=1):
+        started = time.perf_counter()
+        processes = [fork.Process(target=worker, args=(apply, job_id, range(w + 1, students + 1, args.workers)))
+                     for w in range(args.workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+        elapsed = time.perf_counter() - started
+        with app.app_context():
+            assert Application.query.filter_by(job_id=job_id).count() == students
+            db.engine.dispose()
+        print(f'{label:<14}{students / elapsed:>10.0f}{elapsed:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Interview scheduling: full plan across drives, then an incremental re-plan.
+
+    python benchmarks/interviews.py --students 3000 --drives 40 --shortlisted 6000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from seed import use_temp_database, seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=3000)
+    parser.add_argument('--drives', type=int, default=40)
+    parser.add_argument('--shortlisted', type=int, default=6000)
+    parser.add_argument('--panels', type=int, default=3, help='Panels per drive')
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app import create_app
+    from sqlalchemy import insert, update, func, select
+    from models import db, Application, InterviewPanel, InterviewSlot, InterviewAssignment
+    import interviews
+    app = create_app()
+
+    rng = random.Random(7)
+    with app.app_context():
+        seed(db, students=args.students, companies=max(1, args.drives // 2), drives=args.drives,
+             applications=args.shortlisted)
+        db.session.execute(update(Application).values(status='shortlisted'))
+
+        # Every drive interviews over the same two days, so students shortlisted
+        # by several companies compete for the same hours
+        day = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        per_drive = dict(db.session.execute(
+            select(Application.job_id, func.count()).group_by(Application.job_id)).all())
+        slot_rows = []
+        for job_id in range(1, args.drives + 1):
+            for p in range(args.panels):
+                panel = InterviewPanel(job_id=job_id, name=f'Panel {p + 1}')
+                db.session.add(panel)
+                db.session.flush()
+                needed = per_drive.get(job_id, 0) * 11 // (10 * args.panels) + 1
+                start = day + timedelta(days=rng.randint(0, 1), minutes=15 * rng.randint(0, 8))
+                times = interviews.generate_slots(start, start + timedelta(minutes=20 * needed), 20)
+                slot_rows += [{'panel_id': panel.id, 'job_id': job_id, 'starts_at': s, 'ends_at': e}
+                              for s, e in times]
+        db.session.execute(insert(InterviewSlot), slot_rows)
+        db.session.commit()
+        print(f'{args.shortlisted} shortlisted applications, {args.drives} drives, {len(slot_rows)} slots')
+
+        started = time.perf_counter()
+        results = interviews.plan_drives(list(range(1, args.drives + 1)))
+        elapsed = time.perf_counter() - started
+        scheduled = sum(r.scheduled for r in results.values())
+        unscheduled = sum(r.unscheduled for r in results.values())
+        print(f'full plan:     {elapsed:>6.2f}s  {scheduled} scheduled, {unscheduled} unscheduled')
+
+        # Cancel a tenth of one busy drive's slots and re-plan only that drive
+        job_id = max(per_drive, key=per_drive.get)
+        slot_ids = db.session.scalars(select(InterviewAssignment.slot_id)
+                                      .where(InterviewAssignment.job_id == job_id)).all()
+        for slot_id in rng.sample(slot_ids, len(slot_ids) // 10):
+            db.session.delete(db.session.get(InterviewSlot, slot_id))
+        db.session.commit()
+        started = time.perf_counter()
+        result = interviews.plan_drive(job_id)
+        elapsed = time.perf_counter() - started
+        print(f're-plan drive: {elapsed:>6.2f}s  {result.added} added, {result.moved} moved, '
+              f'{result.unscheduled} unscheduled of {per_drive[job_id]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Compare ORM objects and read-model rows for the admin applications list.
+
+    python benchmarks/read_models.py --applications 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from seed import use_temp_database, seed
+
+
+def measure(load, render):
+    """(rows, bytes per row, load ms, render ms) for one way of building the list"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = load()
+    loaded = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    render(rows)
+    rendered = time.perf_counter() - started
+    return len(rows), size / max(len(rows), 1), loaded * 1000, rendered * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=100000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from flask import render_template
+    from sqlalchemy.orm import joinedload
+    from app import create_app
+    from models import db, Application, JobPosting
+    import read_models
+    app = create_app()
+
+    with app.test_request_context('/admin/applications'):
+        seed(db, students=5000, drives=500, companies=50, applications=args.applications)
+        db.session.remove()
+
+        def load_orm():
+            return Application.query.options(
+                joinedload(Application.user), joinedload(Application.job).joinedload(JobPosting.company)
+            ).all()
+
+        def load_rows():
+            return read_models.fetch(read_models.ApplicationRow, read_models.applications_query())
+
+        def render(applications):
+            # The template reads flat fields; ORM objects pay for the relationship traversal the old template did
+            if applications and not isinstance(applications[0], tuple):
+                applications = [read_models.ApplicationRow(
+                    a.id, a.user.username, a.job.title, a.job.company.company_name, a.applied_at, a.status
+                ) for a in applications]
+            render_template('admin_applications.html', applications=applications)
+
+        print(f'{"":<10}{"rows":>9}{"bytes/row":>12}{"load ms":>10}{"render ms":>11}')
+        for label, load in (('orm', load_orm), ('read rows', load_rows)):
+            count, per_row, loaded, rendered = measure(load, render)
+            print(f'{label:<10}{count:>9}{per_row:>12.0f}{loaded:>10.1f}{rendered:>11.1f}')
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Synthetic data for the benchmark scripts.
+
+Every benchmark runs against a throwaway SQLite database so it never touches
+placement_portal.db. Import this module before importing the app.
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BRANCHES = ['Computer Science', 'Electronics', 'Mechanical', 'Civil', 'Electrical', 'Chemical']
+JOB_TYPES = ['Full-time', 'Internship', 'Part-time']
+STATUSES = ['pending', 'reviewed', 'shortlisted', 'rejected', 'accepted']
+SKILLS = ['python', 'java', 'sql', 'embedded', 'cad', 'circuits', 'ml', 'cloud', 'networking', 'design']
+
+
+def use_temp_database(name='bench'):
+    """Point DATABASE_URL at a fresh temporary SQLite file and return its path"""
+    path = os.path.join(tempfile.mkdtemp(prefix='portal-'), f'{name}.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ.setdefault('RATELIMIT_ENABLED', '0')
+    return path
+
+
+def seed(db, students=1000, companies=50, drives=200, applications=10000, password_hash='x'):
+    """Bulk insert users, profiles, drives and applications"""
+    from sqlalchemy import insert
+    from models import User, StudentProfile, CompanyProfile, JobPosting, Application
+
+    rng = random.Random(42)
+    now = datetime.now()
+    db.create_all()
+
+    db.session.execute(insert(User), [
+        {'id': i, 'username': f'student{i}', 'email': f'student{i}@example.com',
+         'password_hash': password_hash, 'role': 'student', 'is_active': True, 'is_approved': True,
+         'created_at': now}
+        for i in range(1, students + 1)
+    ] + [
+        {'id': students + i, 'username': f'company{i}', 'email': f'company{i}@example.com',
+         'password_hash': password_hash, 'role': 'company', 'is_active': True, 'is_approved': True,
+         'created_at': now}
+        for i in range(1, companies + 1)
+    ])
+    db.session.execute(insert(StudentProfile), [
+        {'id': i, 'user_id': i, 'full_name': f'Student {i}', 'roll_number': f'R{i:06d}',
+         'branch': rng.choice(BRANCHES), 'cgpa': round(rng.uniform(5, 10), 2), 'phone': '9876543210'}
+        for i in range(1, students + 1)
+    ])
+    db.session.execute(insert(CompanyProfile), [
+        {'id': i, 'user_id': students + i, 'company_name': f'Company {i}', 'industry': 'Technology',
+         'description': 'A company. ' * 50}
+        for i in range(1, companies + 1)
+    ])
+    db.session.execute(insert(JobPosting), [
+        {'id': i, 'company_id': rng.randint(1, companies), 'title': f'Engineer {i}',
+         'description': 'Role description. ' * 80,
+         'requirements': f"Minimum CGPA {rng.choice([6, 6.5, 7, 7.5, 8])}. {rng.choice(BRANCHES)} "
+                         f"students with {', '.join(rng.sample(SKILLS, 3))}.",
+         'salary': f'{rng.randint(4, 40)} LPA', 'location': rng.choice(['Bangalore', 'Pune', 'Remote']),
+         'job_type': rng.choice(JOB_TYPES), 'posted_at': now - timedelta(days=rng.randint(0, 60)),
+         'deadline': now + timedelta(days=rng.randint(1, 30)), 'is_active': True, 'is_approved': True}
+        for i in range(1, drives + 1)
+    ])
+    pairs = set()
+    while len(pairs) < min(applications, students * drives):
+        pairs.add((rng.randint(1, students), rng.randint(1, drives)))
+    cover_letter = 'I am interested in this role. ' * 20
+    pairs = list(pairs)
+    for start in range(0, len(pairs), 50000):
+        db.session.execute(insert(Application), [
+            {'user_id': user_id, 'job_id': job_id, 'status': rng.choice(STATUSES),
+             'applied_at': now - timedelta(minutes=rng.randint(0, 100000)), 'cover_letter': cover_letter}
+            for user_id, job_id in pairs[start:start + 50000]
+        ])
+    db.session.commit()
@@ -0,0 +1,65 @@
+"""Measure cold start time, first-request latency and memory of the production entry point.
+
+    python benchmarks/startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from seed import ROOT, use_temp_database
+
+PROBE = """
+import json, resource, time
+started = time.perf_counter()
+import wsgi
+loaded = time.perf_counter() - started
+client = wsgi.app.test_client()
+timings = []
+for _ in range(2):
+    started = time.perf_counter()
+    client.get('/login')
+    timings.append(time.perf_counter() - started)
+print(json.dumps({
+    'import_seconds': loaded,
+    'first_request_ms': timings[0] * 1000,
+    'second_request_ms': timings[1] * 1000,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def measure(cache_dir):
+    env = dict(os.environ, JINJA_CACHE_DIR=cache_dir or '')
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    use_temp_database()
+    warm_dir = tempfile.mkdtemp(prefix='portal-jinja-')
+    measure(warm_dir)  # Fill the bytecode cache, as `init_db.py compile-templates` does at deploy time
+    modes = {
+        'no bytecode cache': lambda: measure(None),
+        'cold cache': lambda: measure(tempfile.mkdtemp(prefix='portal-jinja-')),
+        'warm cache': lambda: measure(warm_dir),
+    }
+    for mode, run in modes.items():
+        samples = [run() for _ in range(args.runs)]
+        print(mode)
+        for key in samples[0]:
+            values = [sample[key] for sample in samples]
+            print(f'  {key:<18} median {statistics.median(values):8.3f}  '
+                  f'min {min(values):8.3f}  max {max(values):8.3f}')
+
+
+if __name__ == '__main__':
+    main()
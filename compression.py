@@ -0,0 +1,33 @@
+"""gzip compression of large dynamic responses.
+
+Rendered lists such as the admin applications table are hundreds of
+kilobytes of repetitive markup that shrink around tenfold. Responses of a
+compressible type above COMPRESS_MIN_SIZE are gzipped when the client
+accepts it. Streamed responses (server-sent events) and files sent by
+send_file (including the precompressed assets) are passed through.
+"""
+import gzip
+from flask import current_app, request
+
+
+def compress_response(response):
+    """Gzip a buffered response body when it is large enough and the client accepts it"""
+    config = current_app.config
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.mimetype not in config['COMPRESS_MIMETYPES']):
+        return response
+    data = response.get_data()
+    if len(data) < config['COMPRESS_MIN_SIZE']:
+        return response
+    response.vary.add('Accept-Encoding')
+    if not request.accept_encodings['gzip']:
+        return response
+    response.set_data(gzip.compress(data, config['COMPRESS_LEVEL'], mtime=0))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def init_app(app):
+    """Compress responses after every other after_request hook has run"""
+    if app.config['COMPRESS_ENABLED']:
+        app.after_request(compress_response)
@@ -1,4 +1,6 @@
 import os
+from replicas import replica_binds
+from tenancy import parse_tenants, tenant_binds
 
 class Config:
     # Secret key for session management
@@ -8,5 +10,80 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///placement_portal.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Jinja bytecode cache, relative to the instance folder ('' disables it).
+    # Fill it at deploy time with: python init_db.py compile-templates
+    JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR', 'jinja_cache')
+    
+    # Fingerprinted assets (python init_db.py build-assets) are cached by browsers for a year
+    ASSETS_MAX_AGE = 365 * 86400
+    
+    # gzip for large dynamic responses such as the admin lists
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1') == '1'
+    COMPRESS_MIMETYPES = ('text/html', 'application/json')
+    COMPRESS_MIN_SIZE = 2048  # Bytes; smaller bodies fit in a few packets anyway
+    COMPRESS_LEVEL = 6
+    
+    # Read replicas (comma-separated URLs) used by @read_replica routes
+    SQLALCHEMY_REPLICA_URIS = [uri.strip() for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri.strip()]
+    SQLALCHEMY_BINDS = replica_binds(SQLALCHEMY_REPLICA_URIS)
+    
+    # Archived placement seasons: same database by default, or a separate file
+    SQLALCHEMY_BINDS['archive'] = os.environ.get('ARCHIVE_DATABASE_URL') or SQLALCHEMY_DATABASE_URI
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))  # Read-your-writes window
+    
+    # Colleges served by this deployment, each with its own database: 'slug=url,slug=url'
+    TENANTS = parse_tenants(os.environ.get('TENANT_DATABASE_URLS', ''))
+    SQLALCHEMY_BINDS.update(tenant_binds(TENANTS))
+    DEFAULT_TENANT = os.environ.get('DEFAULT_TENANT')  # Tenant for hosts/paths that name none
+    
+    # asgi.py: threads per worker for the routes it hands to the Flask app
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 16))
+    
+    # Rate limiting and admission control
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', '1') == '1'
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL', 'memory://')  # or redis://host:6379/0
+    LOGIN_RATE_LIMIT = os.environ.get('LOGIN_RATE_LIMIT', '10/minute')  # Per username
+    APPLY_RATE_LIMIT = os.environ.get('APPLY_RATE_LIMIT', '5/minute')  # Per student
+    # Per client IP, shared by everyone behind one campus NAT or proxy
+    LOGIN_IP_RATE_LIMIT = os.environ.get('LOGIN_IP_RATE_LIMIT', '300/minute')
+    APPLY_IP_RATE_LIMIT = os.environ.get('APPLY_IP_RATE_LIMIT', '600/minute')
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted (0: use the socket address)
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    APPLY_MAX_CONCURRENT = int(os.environ.get('APPLY_MAX_CONCURRENT', 16))  # Per worker
+    
+    # Group commit: applications queued while the previous batch commits share one transaction
+    INGEST_ENABLED = os.environ.get('INGEST_ENABLED', '1') == '1'
+    INGEST_MAX_BATCH = 256
+    INGEST_ACK_TIMEOUT = 10  # Seconds a request waits for its batch before answering 503
+    
+    # Drives with more applications than this are deleted by a batched background purge
+    PURGE_BATCH_THRESHOLD = 1000
+    PURGE_BATCH_SIZE = 500
+    PURGE_BATCH_PAUSE = 0.05  # Seconds between batches
+    
+    ARCHIVE_BATCH_SIZE = 500  # Applications moved per transaction
+    
+    # Online backups (python init_db.py backup), relative to the instance folder unless absolute
+    BACKUP_DIR = os.environ.get('BACKUP_DIR', 'backups')
+    BACKUP_PAGES = int(os.environ.get('BACKUP_PAGES', 1024))  # SQLite pages copied per step
+    BACKUP_STEP_PAUSE = float(os.environ.get('BACKUP_STEP_PAUSE', 0.005))  # Seconds between steps
+    BACKUP_MAX_RESTARTS = 5  # Rollback-journal copies restarted by writers before finishing in one step
+    BACKUP_COMPRESS_LEVEL = 6
+    
+    INTERVIEW_GAP_MINUTES = 15  # Minimum gap between a student's interviews for different drives
+    
+    # Placement policy: offers a student may accept before their other applications are withdrawn
+    # (0 disables the policy), and LPA boundaries of salary tiers that stay open to placed students
+    OFFER_MAX_OFFERS = int(os.environ.get('OFFER_MAX_OFFERS', 1))
+    OFFER_SALARY_TIERS = sorted(float(lpa) for lpa in os.environ.get('OFFER_SALARY_TIERS', '').split(',') if lpa.strip())
+    
+    # Live updates over server-sent events
+    EVENTS_BROKER_URL = os.environ.get('EVENTS_BROKER_URL', 'memory://')  # or redis://host:6379/0 across workers
+    EVENTS_HEARTBEAT = 20  # Seconds between keep-alive comments on idle streams
+    EVENTS_WSGI_STREAMS = int(os.environ.get('EVENTS_WSGI_STREAMS', 32))  # Thread-held streams per worker
+    
+    # Analytics reports are recomputed when the data changes, or at least this often (seconds)
+    ANALYTICS_CACHE_TTL = 600
+    
     # Flask-Login configuration
     REMEMBER_COOKIE_DURATION = 86400  # 1 day in seconds
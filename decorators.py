@@ -1,6 +1,10 @@
+import math
 from functools import wraps
-from flask import flash, redirect, url_for
+from flask import flash, redirect, url_for, g, request, current_app, make_response
 from flask_login import current_user
+from replicas import is_pinned_to_primary
+from ratelimit import parse_limit
+from tenancy import current_tenant
 
 def role_required(*roles):
     """Decorator to require specific role(s) for accessing a route"""
@@ -9,11 +13,11 @@ def role_required(*roles):
         def decorated_function(*args, **kwargs):
             if not current_user.is_authenticated:
                 flash('Please log in to access this page.', 'warning')
-                return redirect(url_for('login'))
+                return redirect(url_for('main.login'))
             
             if current_user.role not in roles:
                 flash('You do not have permission to access this page.', 'danger')
-                return redirect(url_for('index'))
+                return redirect(url_for('main.index'))
             
             return f(*args, **kwargs)
         return decorated_function
@@ -25,11 +29,11 @@ def admin_required(f):
     def decorated_function(*args, **kwargs):
         if not current_user.is_authenticated:
             flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
         
         if current_user.role != 'admin':
             flash('Admin access required.', 'danger')
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
         
         return f(*args, **kwargs)
     return decorated_function
@@ -40,11 +44,11 @@ def student_required(f):
     def decorated_function(*args, **kwargs):
         if not current_user.is_authenticated:
             flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
         
         if current_user.role != 'student':
             flash('Student access required.', 'danger')
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
         
         return f(*args, **kwargs)
     return decorated_function
@@ -55,11 +59,84 @@ def company_required(f):
     def decorated_function(*args, **kwargs):
         if not current_user.is_authenticated:
             flash('Please log in to access this page.', 'warning')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
         
         if current_user.role != 'company':
             flash('Company access required.', 'danger')
-            return redirect(url_for('index'))
+            return redirect(url_for('main.index'))
         
         return f(*args, **kwargs)
     return decorated_function
+
+def read_replica(f):
+    """Decorator to serve a read-only route from a read replica when available"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # Users who just wrote keep reading from the primary (read-your-writes)
+        g.use_replica = not is_pinned_to_primary()
+        return f(*args, **kwargs)
+    return decorated_function
+
+def too_many_requests(retry_after, status=429):
+    """Cheap rejection response for throttled requests"""
+    response = make_response('Too many requests. Please try again shortly.', status)
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    response.mimetype = 'text/plain'
+    return response
+
+def rate_limit(config_key, ip_config_key=None, methods=('POST',)):
+    """Decorator to apply per-user and per-IP token buckets configured as e.g. '10/minute'.
+
+    The IP bucket has its own, larger limit (ip_config_key) since many users
+    can share one address behind a campus NAT. A request is only charged when
+    every bucket has a token left.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            config = current_app.config
+            if not config['RATELIMIT_ENABLED'] or request.method not in methods:
+                return f(*args, **kwargs)
+            
+            if current_user.is_authenticated:
+                user_key = str(current_user.id)
+            else:
+                user_key = request.form.get('username')
+            
+            tenant = current_tenant()
+            scope = f'rl:{tenant}:{request.endpoint}' if tenant else f'rl:{request.endpoint}'
+            buckets = []
+            if user_key and config.get(config_key):
+                buckets.append((f'{scope}:user:{user_key}', *parse_limit(config[config_key])))
+            if ip_config_key and config.get(ip_config_key):
+                buckets.append((f'{scope}:ip:{request.remote_addr}', *parse_limit(config[ip_config_key])))
+            if not buckets:
+                return f(*args, **kwargs)
+            
+            allowed, retry_after = current_app.extensions['ratelimit'].consume(buckets)
+            if not allowed:
+                return too_many_requests(retry_after)
+            
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def concurrency_limit(config_key):
+    """Decorator to reject requests beyond a per-worker concurrency cap for the endpoint"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limit = current_app.config.get(config_key)
+            if not limit or not current_app.config['RATELIMIT_ENABLED']:
+                return f(*args, **kwargs)
+            
+            # Each college gets its own slots so one campus's deadline can't starve another
+            slot = current_app.extensions['concurrency'].try_acquire((current_tenant(), request.endpoint), limit)
+            if slot is None:
+                return too_many_requests(1, status=503)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                slot.release()
+        return decorated_function
+    return decorator
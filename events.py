@@ -0,0 +1,219 @@
+"""Live updates pushed to browsers over server-sent events.
+
+Routes publish small JSON events (an application's new status, deltas for
+the dashboard counters) to a user's channel after they commit. Each worker
+keeps one in-process broker that fans events out to the connections it
+holds; with EVENTS_BROKER_URL=redis://... events published by any worker
+reach every worker. Connections are served by the async /events/stream view
+in asgi.py (an idle connection is just a parked coroutine) or, on the plain
+WSGI server, by a generator that holds one thread per connection.
+"""
+import asyncio
+import json
+import queue
+import threading
+from collections import Counter
+from flask import current_app
+from tenancy import current_tenant
+
+REDIS_CHANNEL_PREFIX = 'portal:events:'
+SUBSCRIBER_BUFFER = 64  # Events queued per connection before it is told to resync
+
+
+def channel_for(user_id, tenant=None):
+    """Channel name of one user's event stream"""
+    return f'{tenant or ""}:user:{user_id}'
+
+
+def format_event(event, data):
+    """Encode one server-sent event"""
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+def _drain(pending, empty):
+    try:
+        while True:
+            pending.get_nowait()
+    except empty:
+        pass
+
+
+class Subscriber:
+    """One open connection's buffered events, readable from a thread"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.queue = queue.Queue(SUBSCRIBER_BUFFER)
+
+    def deliver(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # A client this far behind reloads instead of applying a partial set of deltas
+            _drain(self.queue, queue.Empty)
+            self.queue.put_nowait(format_event('resync', {}))
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscriber(Subscriber):
+    """Subscriber read by a coroutine; delivery is handed to its event loop"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(SUBSCRIBER_BUFFER)
+
+    def deliver(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # The connection's event loop has already shut down
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            _drain(self.queue, asyncio.QueueEmpty)
+            self.queue.put_nowait(format_event('resync', {}))
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """Fans events out to the connections held by this worker"""
+
+    def __init__(self):
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscriber):
+        with self._lock:
+            self._channels.setdefault(subscriber.channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subscribers = self._channels.get(subscriber.channel)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._channels[subscriber.channel]
+
+    def connections(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._channels.values())
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.deliver(message)
+
+
+class RedisBroker(Broker):
+    """Broker that relays events between workers through Redis pub/sub"""
+
+    def __init__(self, url):
+        super().__init__()
+        import redis  # Optional dependency, only needed for multi-worker fan-out
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self, subscriber):
+        self._ensure_listening()
+        return super().subscribe(subscriber)
+
+    def publish(self, channel, message):
+        self._client.publish(REDIS_CHANNEL_PREFIX + channel, message)
+
+    def _ensure_listening(self):
+        # One pattern subscription per worker process, started with the first connection
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='events', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(REDIS_CHANNEL_PREFIX + '*')
+        for item in pubsub.listen():
+            channel = item['channel'].decode()[len(REDIS_CHANNEL_PREFIX):]
+            self.deliver(channel, item['data'].decode())
+
+
+def create_broker(url):
+    """Pick a broker from EVENTS_BROKER_URL"""
+    if not url or url == 'memory://':
+        return Broker()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBroker(url)
+    raise ValueError(f'Unsupported events broker: {url}')
+
+
+def init_app(app):
+    """Attach the event broker to the app"""
+    app.extensions['events'] = create_broker(app.config.get('EVENTS_BROKER_URL'))
+
+
+def publish(user_id, event, data):
+    """Send an event to every open connection of a user (call after the change is committed)"""
+    broker = current_app.extensions['events']
+    broker.publish(channel_for(user_id, current_tenant()), format_event(event, data))
+
+
+STUDENT_COUNTERS = {'pending': 'pending_applications', 'shortlisted': 'shortlisted_applications',
+                    'accepted': 'accepted_applications'}
+COMPANY_COUNTERS = {'pending': 'pending_applications', 'shortlisted': 'shortlisted_applications'}
+
+
+def status_changes(company_user_id, changes):
+    """Publish application status changes given as (application_id, job_id, student user_id, old, new)"""
+    company_deltas = Counter()
+    for application_id, job_id, user_id, old, new in changes:
+        if old == new:
+            continue
+        publish(user_id, 'status', {'application_id': application_id, 'job_id': job_id, 'status': new})
+        deltas = Counter()
+        for status, sign in ((old, -1), (new, 1)):
+            if status in STUDENT_COUNTERS:
+                deltas[STUDENT_COUNTERS[status]] += sign
+            if status in COMPANY_COUNTERS:
+                company_deltas[COMPANY_COUNTERS[status]] += sign
+        if any(deltas.values()):
+            publish(user_id, 'counts', deltas)
+    if any(company_deltas.values()):
+        publish(company_user_id, 'counts', company_deltas)
+
+
+def applications_received(pairs):
+    """Publish counter deltas for new applications given as (student user_id, company user_id)"""
+    company_deltas = Counter(company_user_id for _, company_user_id in pairs)
+    for user_id, _ in pairs:
+        publish(user_id, 'counts', {'total_applications': 1, 'pending_applications': 1})
+    for company_user_id, count in company_deltas.items():
+        publish(company_user_id, 'counts', {'total_applications': count, 'pending_applications': count})
+
+
+def stream(broker, channel, heartbeat):
+    """WSGI response body: events as they arrive, with comment heartbeats to keep proxies from timing out"""
+    subscriber = broker.subscribe(Subscriber(channel))
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            message = subscriber.get(timeout=heartbeat)
+            yield message if message is not None else ': keep-alive\n\n'
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,49 @@
+"""Gunicorn settings for production: gunicorn -c gunicorn.conf.py wsgi:app"""
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 2))
+
+# Load the app once in the master; workers fork from it and share its memory
+preload_app = True
+
+# Recycle workers after N requests (with jitter so they don't all restart at once)
+max_requests = int(os.environ.get('MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('MAX_REQUESTS_JITTER', 100))
+
+# Sync worker threads can't afford to sit on live-update streams; run asgi.py for those
+os.environ.setdefault('EVENTS_WSGI_STREAMS', '0')
+
+timeout = int(os.environ.get('WORKER_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Heartbeat files on tmpfs so a slow disk can't make workers look dead
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Move everything imported so far out of the GC's reach before forking.
+
+    Otherwise the first collection in each worker touches every object and
+    un-shares the pages inherited from the master.
+    """
+    gc.collect()
+    gc.freeze()
+    from wsgi import app
+    server.log.info('Application preloaded in %.3fs', app.config['STARTUP_SECONDS'])
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the master"""
+    from wsgi import app
+    from models import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
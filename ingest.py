@@ -0,0 +1,189 @@
+"""Group-commit ingestion of drive applications.
+
+Near a popular deadline many students apply at once, and committing each
+application on its own serialises every request on the database write lock
+(and, for SQLite, on an fsync per commit). Instead, apply requests hand their
+submission to a single writer thread that takes everything queued while it
+was writing the previous batch, re-validates the whole batch with two
+queries, inserts it in one transaction and only then acknowledges each
+waiting request. A lone apply is written at once, without waiting for others. The offer
+policy is checked here too, so an application can't slip in after a
+concurrent acceptance has placed the student.
+"""
+import os
+import queue
+import threading
+from itertools import groupby
+from concurrent.futures import Future
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, insert, tuple_
+from sqlalchemy.exc import IntegrityError
+from models import db, CompanyProfile, JobPosting, Application
+import events
+import policy
+from tenancy import current_tenant, tenant_context
+
+CREATED = 'created'
+DUPLICATE = 'duplicate'
+CLOSED = 'closed'
+INELIGIBLE = 'ineligible'
+
+
+class Submission:
+    __slots__ = ('tenant', 'user_id', 'job_id', 'cover_letter', 'future')
+
+    def __init__(self, user_id, job_id, cover_letter):
+        self.tenant = current_tenant()
+        self.user_id = user_id
+        self.job_id = job_id
+        self.cover_letter = cover_letter
+        self.future = Future()
+
+
+class Ingestor:
+    """Single writer thread that commits queued applications in batches"""
+
+    def __init__(self, app):
+        self.app = app
+        self.queue = queue.Queue()
+        self.thread = None
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def submit(self, user_id, job_id, cover_letter):
+        """Queue an application and wait until its batch is committed; returns CREATED, DUPLICATE, CLOSED or INELIGIBLE"""
+        self._ensure_running()
+        submission = Submission(user_id, job_id, cover_letter)
+        self.queue.put(submission)
+        try:
+            return submission.future.result(timeout=self.app.config['INGEST_ACK_TIMEOUT'])
+        except TimeoutError:
+            # A cancelled submission is skipped by the writer, so the caller's 503 means nothing was written;
+            # one whose batch is already being written can't be cancelled and is waited for instead
+            if submission.future.cancel():
+                raise
+            return submission.future.result()
+
+    def _ensure_running(self):
+        # Started lazily, and again in each forked worker (threads do not survive fork)
+        if self.pid == os.getpid() and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                self.queue = queue.Queue()
+            if self.pid != os.getpid() or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='ingest', daemon=True)
+                self.thread.start()
+                self.pid = os.getpid()
+
+    def _collect(self):
+        """Block for one submission, then take whatever else is already queued.
+
+        Nothing waits for stragglers: a lone apply is written at once, and under
+        load the next batch gathers by itself while the current one commits.
+        """
+        batch = [self.queue.get()]
+        max_batch = self.app.config['INGEST_MAX_BATCH']
+        while len(batch) < max_batch:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = sorted(self._collect(), key=lambda s: s.tenant or '')
+            for tenant, submissions in groupby(batch, key=lambda s: s.tenant):
+                self._commit(tenant, list(submissions))
+
+    def _commit(self, tenant, batch):
+        """Write one tenant's share of a batch and wake up its requests"""
+        # Drop submissions whose requests gave up waiting; the rest can no longer be cancelled
+        batch = [submission for submission in batch if submission.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        with tenant_context(tenant), self.app.app_context():
+            try:
+                results = write_batch(batch)
+            except Exception as error:
+                db.session.rollback()
+                self.app.logger.exception('Application batch of %d failed', len(batch))
+                for submission in batch:
+                    submission.future.set_exception(error)
+                return
+            finally:
+                db.session.remove()
+        for submission, result in zip(batch, results):
+            submission.future.set_result(result)
+
+
+def write_batch(batch):
+    """Validate and insert a batch of submissions in one transaction; returns one result per submission"""
+    job_ids = {s.job_id for s in batch}
+    open_drives = {row.id: row for row in db.session.execute(
+        select(JobPosting.id, JobPosting.season, JobPosting.salary, CompanyProfile.user_id, CompanyProfile.is_dream)
+        .join(CompanyProfile).where(
+            JobPosting.id.in_(job_ids),
+            JobPosting.is_active.is_(True),
+            JobPosting.is_approved.is_(True),
+            JobPosting.pending_deletion.is_(False),
+            JobPosting.deadline >= datetime.now(),
+        )
+    )}
+    # Each drive is judged by the offers held in its own season, as policy.may_apply does
+    placed = policy.placed_by_season({s.user_id for s in batch}, {drive.season for drive in open_drives.values()})
+    pairs = {(s.user_id, s.job_id) for s in batch if s.job_id in open_drives}
+    taken = set(db.session.execute(
+        select(Application.user_id, Application.job_id).where(
+            tuple_(Application.user_id, Application.job_id).in_(pairs))
+    ).tuples()) if pairs else set()
+
+    results, rows, created = [], [], []
+    for s in batch:
+        pair = (s.user_id, s.job_id)
+        drive = open_drives.get(s.job_id)
+        if drive is None:
+            results.append(CLOSED)
+        elif not policy.allows(placed.get((s.user_id, drive.season)), drive.is_dream, drive.salary):
+            results.append(INELIGIBLE)
+        elif pair in taken:
+            results.append(DUPLICATE)
+        else:
+            taken.add(pair)  # A double submit within the same batch
+            rows.append({'user_id': s.user_id, 'job_id': s.job_id, 'status': 'pending',
+                         'cover_letter': s.cover_letter})
+            created.append(len(results))
+            results.append(CREATED)
+
+    if rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Application), rows)
+        except IntegrityError:
+            # Another worker's writer inserted some of these pairs since they were checked:
+            # insert row by row and report the ones the unique constraint rejects as duplicates
+            inserted = []
+            for index, row in zip(created, rows):
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(insert(Application), [row])
+                    inserted.append(row)
+                except IntegrityError:
+                    results[index] = DUPLICATE
+            rows = inserted
+    db.session.commit()
+    events.applications_received([(row['user_id'], open_drives[row['job_id']].user_id) for row in rows])
+    return results
+
+
+def submit_application(user_id, job_id, cover_letter):
+    """Apply through the batching writer, or commit directly when it is disabled"""
+    app = current_app._get_current_object()
+    if not app.config['INGEST_ENABLED']:
+        return write_batch([Submission(user_id, job_id, cover_letter)])[0]
+    ingestor = app.extensions.get('ingest')
+    if ingestor is None:
+        ingestor = app.extensions.setdefault('ingest', Ingestor(app))
+    return ingestor.submit(user_id, job_id, cover_letter)
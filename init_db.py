@@ -1,13 +1,29 @@
-from app import app, db
-from models import User
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import groupby
+from sqlalchemy import inspect, make_url
+from sqlalchemy.schema import CreateTable
+from app import create_app, compile_templates
+from models import db, current_season, User
+import purge
+import archive
+import policy
+import assets
+import backup
+import tenancy
+from replicas import sync_sqlite_replicas
 from werkzeug.security import generate_password_hash
 
-def init_database():
+def init_database(app):
     """Initialize database and create default admin user"""
     with app.app_context():
         # Create all tables
         print("Creating database tables...")
-        db.create_all()
+        tenancy.create_all(db)
         print("✓ Database tables created successfully!")
         
         # Check if admin user already exists
@@ -41,5 +57,293 @@ def init_database():
         
         print("\nDatabase initialization complete!")
 
+def sync_replicas(app):
+    """Copy the primary SQLite database onto the configured local replicas"""
+    with app.app_context():
+        if not app.config['SQLALCHEMY_REPLICA_URIS']:
+            print("No replicas configured (set DATABASE_REPLICA_URLS).")
+            return
+        for path in sync_sqlite_replicas(db):
+            print(f"✓ Replica refreshed: {path}")
+
+def recommend(app):
+    """Recompute the top drive recommendations for every student (run periodically)"""
+    from recommendations import compute_recommendations
+    with app.app_context():
+        start = time.perf_counter()
+        count = compute_recommendations()
+        print(f"✓ {count} recommendations computed in {time.perf_counter() - start:.2f}s")
+
+# Which of a student's duplicate applications to a drive migrate keeps: the one that got furthest, then the first
+STATUS_RANK = {'accepted': 0, 'shortlisted': 1, 'reviewed': 2, 'pending': 3, 'rejected': 4, 'withdrawn': 5}
+
+def duplicate_applications(conn):
+    """Applications sharing a (user_id, job_id) pair: (column names, [(row kept, [rows dropped])])"""
+    result = conn.exec_driver_sql(
+        'SELECT a.* FROM applications a JOIN '
+        '(SELECT user_id, job_id FROM applications GROUP BY user_id, job_id HAVING COUNT(*) > 1) d '
+        'ON a.user_id = d.user_id AND a.job_id = d.job_id ORDER BY a.user_id, a.job_id, a.id')
+    columns = list(result.keys())
+    pairs = []
+    for _, rows in groupby(result.all(), key=lambda row: (row.user_id, row.job_id)):
+        rows = sorted(rows, key=lambda row: (STATUS_RANK.get(row.status, len(STATUS_RANK)), row.id))
+        pairs.append((rows[0], rows[1:]))
+    return columns, pairs
+
+def migrate_database(app, drop_duplicates=False):
+    """Rebuild existing SQLite tables to match models.py (new columns, indexes, ON DELETE CASCADE);
+    returns whether the migration ran"""
+    with app.app_context():
+        engine = tenancy.tenant_engine(db)
+        if engine.dialect.name != 'sqlite':
+            print("Automatic migration only supports SQLite; use your database's migration tooling.")
+            return True
+        
+        with engine.connect() as conn:
+            existing = set(inspect(conn).get_table_names())
+            if 'applications' in existing:
+                # Duplicates predating the unique (user_id, job_id) constraint are only deleted when asked to,
+                # after being saved (their interview slots go with them via ON DELETE CASCADE)
+                columns, pairs = duplicate_applications(conn)
+                if pairs:
+                    dropped = [row for _, rows in pairs for row in rows]
+                    print(f"⚠ {len(dropped)} duplicate applications in {len(pairs)} (student, drive) pairs:")
+                    for kept, rows in pairs[:20]:
+                        print(f"  student {kept.user_id}, drive {kept.job_id}: keep #{kept.id} ({kept.status}), "
+                              f"drop {', '.join(f'#{row.id} ({row.status})' for row in rows)}")
+                    if len(pairs) > 20:
+                        print(f"  ... and {len(pairs) - 20} more pairs")
+                    if not drop_duplicates:
+                        print("✗ Nothing was changed. Run again with --drop-duplicates to delete the rows marked "
+                              "drop (they are saved to a CSV file in the instance folder first).")
+                        return False
+                    os.makedirs(app.instance_path, exist_ok=True)
+                    label = tenancy.current_tenant() or 'portal'
+                    path = os.path.join(app.instance_path,
+                                        f"{label}-dropped-applications-{datetime.now():%Y%m%d-%H%M%S}.csv")
+                    with open(path, 'w', newline='') as f:
+                        writer = csv.writer(f)
+                        writer.writerow(columns)
+                        writer.writerows(dropped)
+                    ids = [row.id for row in dropped]
+                    for start in range(0, len(ids), 500):
+                        chunk = ids[start:start + 500]
+                        conn.exec_driver_sql(f"DELETE FROM applications WHERE id IN ({', '.join('?' * len(chunk))})",
+                                             tuple(chunk))
+                    conn.commit()
+                    print(f"✓ Dropped applications {', '.join(f'#{i}' for i in ids)}; saved to {path}")
+            
+            # SQLite can't alter constraints in place: copy each table into a fresh one
+            conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            quote = conn.dialect.identifier_preparer.quote
+            
+            for table in db.metadata.sorted_tables:
+                if table.name not in existing:
+                    continue
+                old_columns = {column['name'] for column in inspect(conn).get_columns(table.name)}
+                copied = [column for column in table.columns if column.name in old_columns]
+                defaulted = [column for column in table.columns if column.name not in old_columns
+                             and column.default is not None and column.default.is_scalar]
+                
+                name, new_name = quote(table.name), quote(f'{table.name}__new')
+                ddl = str(CreateTable(table).compile(conn)).replace(
+                    f'CREATE TABLE {name} (', f'CREATE TABLE {new_name} (', 1)
+                conn.exec_driver_sql(ddl)
+                targets = ', '.join(quote(column.name) for column in copied + defaulted)
+                sources = ', '.join([quote(column.name) for column in copied] + ['?'] * len(defaulted))
+                conn.exec_driver_sql(f'INSERT INTO {new_name} ({targets}) SELECT {sources} FROM {name}',
+                                     tuple(column.default.arg for column in defaulted))
+                conn.exec_driver_sql(f'DROP TABLE {name}')
+                conn.exec_driver_sql(f'ALTER TABLE {new_name} RENAME TO {name}')
+                for index in table.indexes:
+                    index.create(conn)
+                print(f"✓ Rebuilt table {table.name}")
+            
+            conn.commit()
+            conn.exec_driver_sql('PRAGMA foreign_keys=ON')
+            violations = conn.exec_driver_sql('PRAGMA foreign_key_check').all()
+            if violations:
+                print(f"⚠ {len(violations)} rows reference missing parents, e.g. {violations[:5]}")
+        
+        tenancy.create_all(db)
+        backfilled = archive.backfill_seasons()
+        if backfilled:
+            print(f"✓ Assigned a placement season to {backfilled} existing drives")
+        print("✓ Migration complete!")
+        return True
+
+def purge_data(app, user_id=None):
+    """Finish interrupted drive deletions, or remove a user with all their data"""
+    with app.app_context():
+        if user_id is not None:
+            deleted = purge.purge_user(user_id)
+            print(f"✓ User {user_id} removed ({deleted} applications)")
+        else:
+            drive_ids = purge.purge_pending_drives()
+            print(f"✓ {len(drive_ids)} pending drive deletions completed")
+
+def archive_data(app, season=None, force=False):
+    """Move a closed season into the archive tables, or list seasons still in the hot tables"""
+    with app.app_context():
+        if season is None:
+            for name, drives, applications in archive.season_summary():
+                print(f"  {name or '(none)'}: {drives} drives, {applications} applications")
+            return
+        start = time.perf_counter()
+        try:
+            drives, applications = archive.archive_season(season, force=force)
+        except archive.SeasonStillOpen as e:
+            print(f"✗ {e} Use --force to archive anyway.")
+            return
+        print(f"✓ Archived {drives} drives and {applications} applications from {season} "
+              f"in {time.perf_counter() - start:.1f}s")
+
+def enforce_policy(app, season=None):
+    """Re-apply the placement offer policy to every placed student's live applications in a season"""
+    with app.app_context():
+        season = season or current_season()
+        start = time.perf_counter()
+        withdrawn, placed = policy.reevaluate(season)
+        print(f"✓ {season}: {withdrawn} applications withdrawn for {placed} placed students "
+              f"in {time.perf_counter() - start:.2f}s")
+
+def compile_all_templates(app):
+    """Precompile the templates into the Jinja bytecode cache (run at deploy time)"""
+    if not app.config['JINJA_CACHE_DIR']:
+        print("Bytecode cache disabled (JINJA_CACHE_DIR is empty).")
+        return
+    start = time.perf_counter()
+    count = compile_templates(app)
+    print(f"✓ {count} templates compiled in {time.perf_counter() - start:.2f}s")
+
+def backup_database(app, directory=None):
+    """Take an online, compressed and verified backup of the database (and of a separate archive database);
+    returns whether every backup succeeded"""
+    ok = True
+    with app.app_context():
+        directory = os.path.join(app.instance_path, directory or app.config['BACKUP_DIR'])
+        os.makedirs(directory, exist_ok=True)
+        engines = {tenancy.current_tenant() or 'portal': tenancy.tenant_engine(db)}
+        if not tenancy.current_tenant() and db.engines['archive'].url != db.engine.url:
+            engines['archive'] = db.engines['archive']
+        for label, engine in engines.items():
+            try:
+                result = backup.backup(engine.url, backup.backup_path(directory, label, engine.url))
+            except backup.BackupError as e:
+                print(f"✗ {label}: {e}")
+                ok = False
+                continue
+            mb = 1024 * 1024
+            print(f"✓ {label}: {result.size / mb:,.1f} MB in {result.seconds:.1f}s "
+                  f"({result.size / mb / max(result.seconds, 1e-6):,.0f} MB/s), "
+                  f"{result.compressed / mb:,.1f} MB compressed ({result.size / max(result.compressed, 1):.1f}x), "
+                  f"database copied in {result.copy_seconds:.1f}s ({result.steps} steps, {result.restarts} restarts)")
+            print(f"  {result.path}")
+            if result.restarts > app.config['BACKUP_MAX_RESTARTS']:
+                print("  Writers kept restarting the copy, so it finished in one step that made them wait; "
+                      "switch the database to WAL mode so backups never block writers.")
+    return ok
+
+def restore_database(app, path, url):
+    """Verify a backup and restore it into a fresh database; returns whether it succeeded"""
+    url = make_url(url)
+    relative = url.database not in (None, '', ':memory:') and not os.path.isabs(url.database)
+    if url.get_backend_name() == 'sqlite' and relative:
+        # Relative SQLite paths live in the instance folder, as the app resolves them
+        os.makedirs(app.instance_path, exist_ok=True)
+        url = url.set(database=os.path.join(app.instance_path, url.database))
+    with app.app_context():
+        start = time.perf_counter()
+        try:
+            backup.restore(path, url)
+        except backup.BackupError as e:
+            print(f"✗ {e}")
+            return False
+        print(f"✓ Restored {path} into {url.render_as_string()} in {time.perf_counter() - start:.1f}s")
+        return True
+
+def build_assets(app):
+    """Fingerprint and precompress the static assets (run at deploy time)"""
+    start = time.perf_counter()
+    built = assets.build(app.static_folder)
+    for name, (hashed, sizes) in built.items():
+        variants = ', '.join(f"{encoding} {size:,}" for encoding, size in sizes.items() if encoding != 'identity')
+        print(f"  {name} -> {hashed} ({sizes['identity']:,} bytes{'; ' + variants if variants else ''})")
+    if assets.load_brotli() is None:
+        print("  (install the brotli package to also write .br variants)")
+    print(f"✓ {len(built)} assets built in {time.perf_counter() - start:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Placement portal database tools')
+    parser.add_argument('--tenant', action='append', metavar='SLUG',
+                        help='Only run for this college (repeatable; default: every configured college)')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('init', help='Create tables and the default admin user (default)')
+    migrate_parser = commands.add_parser('migrate', help='Rebuild SQLite tables to match models.py')
+    migrate_parser.add_argument('--drop-duplicates', action='store_true',
+                                help='Delete duplicate applications (reported, and saved to a CSV file first)')
+    commands.add_parser('sync-replicas', help='Refresh local SQLite replicas from the primary')
+    commands.add_parser('compile-templates', help='Fill the Jinja bytecode cache so workers start warm')
+    commands.add_parser('build-assets', help='Fingerprint and precompress static assets into static/dist')
+    commands.add_parser('recommend', help='Recompute drive recommendations')
+    policy_parser = commands.add_parser('enforce-policy',
+                                        help='Withdraw applications the placement offer policy no longer allows')
+    policy_parser.add_argument('--season', help='Season label, e.g. 2024-25 (default: the current season)')
+    purge_parser = commands.add_parser('purge', help='Finish pending drive deletions or remove a user')
+    purge_parser.add_argument('--user', type=int, help='ID of a user to remove with all their data')
+    archive_parser = commands.add_parser('archive', help='Archive a closed placement season (no season: list seasons)')
+    archive_parser.add_argument('season', nargs='?', help='Season label, e.g. 2023-24')
+    archive_parser.add_argument('--force', action='store_true', help='Archive even if drives are still open')
+    backup_parser = commands.add_parser('backup', help='Take an online, compressed and verified database backup')
+    backup_parser.add_argument('--dir', help='Backup directory (default: BACKUP_DIR in the instance folder)')
+    restore_parser = commands.add_parser('restore', help='Restore a backup into a fresh database')
+    restore_parser.add_argument('path', help='Backup file written by the backup command')
+    restore_parser.add_argument('database_url', help='New SQLite file or empty PostgreSQL database, as a URL')
+    args = parser.parse_args()
+    app = create_app()
+    
+    if args.command == 'sync-replicas':
+        sync_replicas(app)  # Replicas belong to the primary database only
+        return
+    if args.command == 'compile-templates':
+        compile_all_templates(app)
+        return
+    if args.command == 'build-assets':
+        build_assets(app)
+        return
+    if args.command == 'restore':
+        if not restore_database(app, args.path, args.database_url):
+            sys.exit(1)  # So scheduled jobs notice
+        return
+    
+    tenants = args.tenant or list(app.config['TENANTS']) or [None]
+    failed = False
+    for slug in tenants:
+        if slug is not None and slug not in app.config['TENANTS']:
+            print(f"✗ Unknown college '{slug}' (configured: {', '.join(app.config['TENANTS']) or 'none'})")
+            failed = True
+            continue
+        if slug:
+            print(f"\n== {slug} ==")
+        with tenancy.tenant_context(slug):
+            if args.command in (None, 'init'):
+                init_database(app)
+            elif args.command == 'migrate':
+                if not migrate_database(app, args.drop_duplicates):
+                    failed = True
+            elif args.command == 'recommend':
+                recommend(app)
+            elif args.command == 'enforce-policy':
+                enforce_policy(app, args.season)
+            elif args.command == 'purge':
+                purge_data(app, args.user)
+            elif args.command == 'archive':
+                archive_data(app, args.season, args.force)
+            elif args.command == 'backup':
+                if not backup_database(app, args.dir):
+                    failed = True
+    if failed:
+        sys.exit(1)  # Every college was attempted; let cron or the deploy job see the failure
+
 if __name__ == '__main__':
-    init_database()
+    main()
@@ -0,0 +1,219 @@
+"""Interview scheduling for shortlisted applicants.
+
+A drive's shortlisted applications are matched to its upcoming panel slots
+as a maximum bipartite matching (Hopcroft-Karp), where an application may
+only take a slot that does not clash, give or take INTERVIEW_GAP_MINUTES,
+with the student's interviews for other drives. Re-planning starts from the
+current schedule: assignments that are still valid are kept as the initial
+matching and only move when that lets an unscheduled candidate in, so adding
+or removing slots disturbs as few students as possible.
+"""
+from bisect import bisect_left
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.orm import aliased
+from models import db, Application, InterviewSlot, InterviewAssignment
+
+PlanResult = namedtuple('PlanResult', 'scheduled added moved dropped unscheduled')
+
+UNMATCHED = -1
+
+
+class SlotClash(ValueError):
+    """Raised when a new slot overlaps an existing slot of the same panel"""
+
+
+def generate_slots(start, end, minutes, break_minutes=0):
+    """Consecutive (starts_at, ends_at) pairs of the given length between start and end"""
+    length, step = timedelta(minutes=minutes), timedelta(minutes=minutes + break_minutes)
+    slots = []
+    while start + length <= end:
+        slots.append((start, start + length))
+        start += step
+    return slots
+
+
+def add_slots(panel, times):
+    """Add slots to a panel, refusing any that overlap the panel's existing slots"""
+    taken = sorted((slot.starts_at, slot.ends_at) for slot in panel.slots)
+    for starts_at, ends_at in times:
+        if any(s < ends_at and e > starts_at for s, e in taken):
+            raise SlotClash(f'{panel.name} already has an interview at {starts_at:%Y-%m-%d %H:%M}.')
+    db.session.execute(insert(InterviewSlot), [
+        {'panel_id': panel.id, 'job_id': panel.job_id, 'starts_at': s, 'ends_at': e} for s, e in times
+    ])
+
+
+def hopcroft_karp(adjacency, n_right, match_left=None):
+    """Maximum bipartite matching; returns the right vertex matched to each left vertex (or -1).
+
+    adjacency[i] lists the right vertices left vertex i may take, in order of
+    preference. A partial matching passed as match_left is extended, never
+    shrunk: vertices matched on entry stay matched.
+    """
+    n_left = len(adjacency)
+    match_left = list(match_left) if match_left else [UNMATCHED] * n_left
+    match_right = [UNMATCHED] * n_right
+    for i, j in enumerate(match_left):
+        if j != UNMATCHED:
+            match_right[j] = i
+
+    while True:
+        # Layer the graph by shortest alternating paths from the free left vertices
+        dist = [None] * n_left
+        queue = deque()
+        for i in range(n_left):
+            if match_left[i] == UNMATCHED:
+                dist[i] = 0
+                queue.append(i)
+        shortest = None  # Layer of the left vertices nearest a free right vertex
+        while queue:
+            i = queue.popleft()
+            if shortest is not None and dist[i] > shortest:
+                break
+            for j in adjacency[i]:
+                k = match_right[j]
+                if k == UNMATCHED:
+                    shortest = dist[i]
+                elif dist[k] is None:
+                    dist[k] = dist[i] + 1
+                    queue.append(k)
+        if shortest is None:
+            return match_left
+
+        # Augment along vertex-disjoint shortest paths (iterative DFS)
+        pointer = [0] * n_left
+        for root in range(n_left):
+            if match_left[root] != UNMATCHED:
+                continue
+            stack = [root]
+            while stack:
+                i = stack[-1]
+                if pointer[i] == len(adjacency[i]):
+                    dist[i] = None  # Dead end for the rest of this phase
+                    stack.pop()
+                    if stack:
+                        pointer[stack[-1]] += 1
+                    continue
+                j = adjacency[i][pointer[i]]
+                k = match_right[j]
+                if k == UNMATCHED and dist[i] == shortest:
+                    for left in stack:
+                        right = adjacency[left][pointer[left]]
+                        match_left[left], match_right[right] = right, left
+                    break
+                if k != UNMATCHED and dist[k] is not None and dist[k] == dist[i] + 1 and dist[k] <= shortest:
+                    stack.append(k)
+                else:
+                    pointer[i] += 1
+
+
+def release_slots(application_ids):
+    """Free the upcoming slots held by applications that are no longer shortlisted (caller commits);
+    interviews that already took place are kept. Returns how many slots were freed"""
+    return db.session.execute(delete(InterviewAssignment).where(
+        InterviewAssignment.application_id.in_(application_ids),
+        InterviewAssignment.slot_id.in_(select(InterviewSlot.id).where(InterviewSlot.starts_at >= datetime.now()))
+    ), execution_options={'synchronize_session': False}).rowcount
+
+
+def _busy_times(drive_id, gap):
+    """{user_id: [(start, end)]} of other drives' interviews of this drive's shortlisted students"""
+    candidate = aliased(Application)
+    rows = db.session.execute(
+        select(InterviewAssignment.user_id, InterviewSlot.starts_at, InterviewSlot.ends_at)
+        .join(InterviewSlot, InterviewAssignment.slot_id == InterviewSlot.id)
+        .join(candidate, candidate.user_id == InterviewAssignment.user_id)
+        .where(candidate.job_id == drive_id, candidate.status == 'shortlisted',
+               InterviewAssignment.job_id != drive_id)
+    ).all()
+    busy = {}
+    for user_id, starts_at, ends_at in rows:
+        busy.setdefault(user_id, []).append((starts_at - gap, ends_at + gap))
+    return busy
+
+
+def plan_drive(drive_id):
+    """(Re)schedule a drive's shortlisted applications into its upcoming slots"""
+    now = datetime.now()
+    gap = timedelta(minutes=current_app.config['INTERVIEW_GAP_MINUTES'])
+
+    slots = db.session.execute(
+        select(InterviewSlot.id, InterviewSlot.starts_at, InterviewSlot.ends_at)
+        .where(InterviewSlot.job_id == drive_id, InterviewSlot.starts_at >= now)
+        .order_by(InterviewSlot.starts_at, InterviewSlot.id)
+    ).all()
+    current = dict(db.session.execute(
+        select(InterviewAssignment.application_id, InterviewAssignment.slot_id)
+        .where(InterviewAssignment.job_id == drive_id)
+    ).all())
+    past = set(db.session.scalars(
+        select(InterviewAssignment.application_id).join(InterviewSlot)
+        .where(InterviewAssignment.job_id == drive_id, InterviewSlot.starts_at < now)
+    ))
+    # Candidates whose interview already took place are left alone
+    candidates = [row for row in db.session.execute(
+        select(Application.id, Application.user_id)
+        .where(Application.job_id == drive_id, Application.status == 'shortlisted')
+        .order_by(Application.applied_at, Application.id)
+    ).all() if row.id not in past]
+    busy = _busy_times(drive_id, gap)
+
+    # Slots a candidate may take: every upcoming slot except those clashing with other interviews
+    starts = [slot.starts_at for slot in slots]
+    longest = max((slot.ends_at - slot.starts_at for slot in slots), default=timedelta(0))
+    slot_index = {slot.id: j for j, slot in enumerate(slots)}
+    adjacency, seed = [], []
+    for application_id, user_id in candidates:
+        blocked = set()
+        for busy_start, busy_end in busy.get(user_id, ()):
+            for j in range(bisect_left(starts, busy_start - longest), bisect_left(starts, busy_end)):
+                if slots[j].ends_at > busy_start:
+                    blocked.add(j)
+        allowed = [j for j in range(len(slots)) if j not in blocked]
+        adjacency.append(allowed)
+        kept = slot_index.get(current.get(application_id), UNMATCHED)
+        seed.append(kept if kept not in blocked else UNMATCHED)
+
+    matching = hopcroft_karp(adjacency, len(slots), seed)
+
+    planned = {candidates[i].id: slots[j].id for i, j in enumerate(matching) if j != UNMATCHED}
+    stale = [application_id for application_id, slot_id in current.items()
+             if application_id not in past and planned.get(application_id) != slot_id]
+    fresh = [(application_id, slot_id) for application_id, slot_id in planned.items()
+             if current.get(application_id) != slot_id]
+    if stale:
+        db.session.execute(delete(InterviewAssignment).where(InterviewAssignment.application_id.in_(stale)))
+    if fresh:
+        user_of = {row.id: row.user_id for row in candidates}
+        db.session.execute(insert(InterviewAssignment), [
+            {'application_id': application_id, 'slot_id': slot_id, 'job_id': drive_id,
+             'user_id': user_of[application_id], 'assigned_at': datetime.utcnow()}
+            for application_id, slot_id in fresh
+        ])
+    db.session.commit()
+
+    moved = sum(1 for application_id, _ in fresh if application_id in current)
+    return PlanResult(scheduled=len(planned), added=len(fresh) - moved, moved=moved,
+                      dropped=len(set(stale) - set(planned)), unscheduled=len(candidates) - len(planned))
+
+
+def plan_drives(drive_ids):
+    """Schedule several drives, tightest first (fewest spare slots per candidate), so they get first pick"""
+    now = datetime.now()
+    slack = dict.fromkeys(drive_ids, 0)
+    for drive_id, count in db.session.execute(
+        select(InterviewSlot.job_id, func.count()).where(InterviewSlot.job_id.in_(drive_ids),
+                                                        InterviewSlot.starts_at >= now)
+        .group_by(InterviewSlot.job_id)
+    ):
+        slack[drive_id] += count
+    for drive_id, count in db.session.execute(
+        select(Application.job_id, func.count()).where(Application.job_id.in_(drive_ids),
+                                                      Application.status == 'shortlisted')
+        .group_by(Application.job_id)
+    ):
+        slack[drive_id] -= count
+    return {drive_id: plan_drive(drive_id) for drive_id in sorted(drive_ids, key=lambda d: (slack[d], d))}
@@ -1,8 +1,31 @@
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from replicas import RoutingSession
+from tenancy import session_user_id
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+SEASON_START_MONTH = 7  # Placement seasons run July to June, e.g. '2024-25'
+
+def season_for(when):
+    """Placement season label for a date"""
+    start = when.year if when.month >= SEASON_START_MONTH else when.year - 1
+    return f'{start}-{(start + 1) % 100:02d}'
+
+def current_season():
+    return season_for(datetime.utcnow())
+
+@event.listens_for(Engine, 'connect')
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
 
 class User(UserMixin, db.Model):
     """User model for authentication and role management"""
@@ -17,10 +40,15 @@ class User(UserMixin, db.Model):
     is_active = db.Column(db.Boolean, default=True)  # For blacklist/deactivate
     is_approved = db.Column(db.Boolean, default=False)  # For company approval
     
-    # Relationships
-    student_profile = db.relationship('StudentProfile', backref='user', uselist=False, cascade='all, delete-orphan')
-    company_profile = db.relationship('CompanyProfile', backref='user', uselist=False, cascade='all, delete-orphan')
-    applications = db.relationship('Application', backref='user', cascade='all, delete-orphan')
+    # Relationships (children are removed by ON DELETE CASCADE, not loaded and deleted one by one)
+    student_profile = db.relationship('StudentProfile', backref='user', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
+    company_profile = db.relationship('CompanyProfile', backref='user', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
+    applications = db.relationship('Application', backref='user', cascade='all, delete-orphan', passive_deletes=True)
+    recommendations = db.relationship('DriveRecommendation', backref='user', cascade='all, delete-orphan', passive_deletes=True)
+    
+    def get_id(self):
+        """Login session identity, so a session from one college never loads a user of another"""
+        return session_user_id(self.id)
     
     def __repr__(self):
         return f'<User {self.username} ({self.role})>'
@@ -30,13 +58,14 @@ class StudentProfile(db.Model):
     __tablename__ = 'student_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, unique=True)
     full_name = db.Column(db.String(120), nullable=False)
     roll_number = db.Column(db.String(50), unique=True, nullable=False)
     branch = db.Column(db.String(100), nullable=False)
     cgpa = db.Column(db.Float, nullable=False)
     resume_path = db.Column(db.String(255))
     phone = db.Column(db.String(20))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Analytics data version
     
     def __repr__(self):
         return f'<StudentProfile {self.full_name} - {self.roll_number}>'
@@ -46,7 +75,7 @@ class CompanyProfile(db.Model):
     __tablename__ = 'company_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, unique=True)
     company_name = db.Column(db.String(150), nullable=False)
     industry = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -54,9 +83,11 @@ class CompanyProfile(db.Model):
     contact_person = db.Column(db.String(120))
     contact_email = db.Column(db.String(120))
     contact_phone = db.Column(db.String(20))
+    is_dream = db.Column(db.Boolean, default=False, nullable=False)  # Stays open to already placed students
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Analytics data version
     
     # Relationships
-    job_postings = db.relationship('JobPosting', backref='company', cascade='all, delete-orphan')
+    job_postings = db.relationship('JobPosting', backref='company', cascade='all, delete-orphan', passive_deletes=True)
     
     def __repr__(self):
         return f'<CompanyProfile {self.company_name}>'
@@ -66,7 +97,7 @@ class JobPosting(db.Model):
     __tablename__ = 'job_postings'
     
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('company_profiles.id'), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('company_profiles.id', ondelete='CASCADE'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     requirements = db.Column(db.Text, nullable=False)
@@ -77,9 +108,15 @@ class JobPosting(db.Model):
     deadline = db.Column(db.DateTime, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     is_approved = db.Column(db.Boolean, default=False)  # Admin approval for drives
+    pending_deletion = db.Column(db.Boolean, default=False)  # Hidden while a background purge removes it
+    season = db.Column(db.String(9), default=current_season, index=True)  # e.g. 2024-25
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Analytics data version
     
     # Relationships
-    applications = db.relationship('Application', backref='job', cascade='all, delete-orphan')
+    applications = db.relationship('Application', backref='job', cascade='all, delete-orphan', passive_deletes=True)
+    recommendations = db.relationship('DriveRecommendation', backref='job', cascade='all, delete-orphan', passive_deletes=True)
+    interview_panels = db.relationship('InterviewPanel', backref='job', cascade='all, delete-orphan', passive_deletes=True,
+                                       order_by='InterviewPanel.id')
     
     def __repr__(self):
         return f'<JobPosting {self.title}>'
@@ -87,13 +124,123 @@ class JobPosting(db.Model):
 class Application(db.Model):
     """Job application by students"""
     __tablename__ = 'applications'
+    __table_args__ = (
+        # One application per student and drive, even across workers; also serves per-student lookups
+        db.UniqueConstraint('user_id', 'job_id', name='uq_applications_user_job'),
+        # Placed-student lookups for the offer policy (status='accepted')
+        db.Index('ix_applications_status_user', 'status', 'user_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    status = db.Column(db.String(20), default='pending')  # pending, reviewed, shortlisted, rejected, accepted
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, reviewed, shortlisted, rejected, accepted, withdrawn
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     cover_letter = db.Column(db.Text)
     
     def __repr__(self):
         return f'<Application {self.id} - {self.status}>'
+
+class DriveRecommendation(db.Model):
+    """Precomputed top-K drive matches per student (rebuilt by the recommendation batch job)"""
+    __tablename__ = 'drive_recommendations'
+    
+    # (user_id, rank) primary key: a student's list is one contiguous index range scan
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    score = db.Column(db.Float, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DriveRecommendation user={self.user_id} #{self.rank} job={self.job_id}>'
+
+class InterviewPanel(db.Model):
+    """Interview panel of a drive; each panel interviews one candidate per slot"""
+    __tablename__ = 'interview_panels'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    slots = db.relationship('InterviewSlot', backref='panel', cascade='all, delete-orphan', passive_deletes=True,
+                            order_by='InterviewSlot.starts_at')
+    
+    def __repr__(self):
+        return f'<InterviewPanel {self.name}>'
+
+class InterviewSlot(db.Model):
+    """Time slot of an interview panel"""
+    __tablename__ = 'interview_slots'
+    __table_args__ = (
+        db.Index('ix_interview_slots_job_start', 'job_id', 'starts_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    panel_id = db.Column(db.Integer, db.ForeignKey('interview_panels.id', ondelete='CASCADE'), nullable=False, index=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False)  # Denormalized for per-drive planning
+    starts_at = db.Column(db.DateTime, nullable=False)
+    ends_at = db.Column(db.DateTime, nullable=False)
+    
+    # Relationships
+    assignment = db.relationship('InterviewAssignment', backref='slot', uselist=False, cascade='all, delete-orphan',
+                                 passive_deletes=True)
+    
+    def __repr__(self):
+        return f'<InterviewSlot {self.starts_at:%Y-%m-%d %H:%M}>'
+
+class InterviewAssignment(db.Model):
+    """Shortlisted application scheduled into an interview slot (one per application and per slot)"""
+    __tablename__ = 'interview_assignments'
+    
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), primary_key=True)
+    slot_id = db.Column(db.Integer, db.ForeignKey('interview_slots.id', ondelete='CASCADE'), nullable=False, unique=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)  # Clash checks across drives
+    assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<InterviewAssignment application={self.application_id} slot={self.slot_id}>'
+
+class ArchivedJobPosting(db.Model):
+    """Drive from a closed placement season, moved out of job_postings by the archive command"""
+    __tablename__ = 'archived_job_postings'
+    __bind_key__ = 'archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # Same id as the original drive
+    company_id = db.Column(db.Integer, nullable=False, index=True)
+    company_name = db.Column(db.String(150), nullable=False)  # Copied so archives stand alone
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text, nullable=False)
+    salary = db.Column(db.String(100))
+    location = db.Column(db.String(150), nullable=False)
+    job_type = db.Column(db.String(50), nullable=False)
+    posted_at = db.Column(db.DateTime)
+    deadline = db.Column(db.DateTime, nullable=False)
+    season = db.Column(db.String(9), nullable=False, index=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    applications = db.relationship('ArchivedApplication', backref='job', cascade='all, delete-orphan', passive_deletes=True)
+    
+    def __repr__(self):
+        return f'<ArchivedJobPosting {self.title} ({self.season})>'
+
+class ArchivedApplication(db.Model):
+    """Application from a closed placement season"""
+    __tablename__ = 'archived_applications'
+    __bind_key__ = 'archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # Same id as the original application
+    job_id = db.Column(db.Integer, db.ForeignKey('archived_job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)  # No FK: the archive may live in another database
+    status = db.Column(db.String(20))
+    applied_at = db.Column(db.DateTime)
+    cover_letter = db.Column(db.Text)
+    
+    def __repr__(self):
+        return f'<ArchivedApplication {self.id} - {self.status}>'
@@ -0,0 +1,148 @@
+"""Placement offer policy.
+
+Once a student holds OFFER_MAX_OFFERS accepted offers (one by default) they
+are placed: their other live applications are withdrawn in the same
+transaction as the acceptance, and they can no longer apply to drives.
+Two exceptions stay open to placed students: drives of companies the admin
+has flagged as dream companies, and drives in a higher salary tier
+(OFFER_SALARY_TIERS, e.g. "10,20" LPA) than the best offer they hold.
+Withdrawals are set-based UPDATEs, one per salary tier of the placed
+students, so re-evaluating a whole season after a policy change is a
+handful of statements. The policy applies within a placement season: offers
+from a season that hasn't been archived yet don't place a student in the
+next one.
+"""
+from bisect import bisect_right
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update, delete, and_, or_, true
+from models import db, current_season, CompanyProfile, JobPosting, Application, InterviewAssignment
+from salaries import parse_salary
+
+LIVE_STATUSES = ('pending', 'reviewed', 'shortlisted')
+WITHDRAWN = 'withdrawn'
+CHUNK = 500  # Students per UPDATE when re-evaluating a season
+
+
+def tier(salary):
+    """Salary tier of a free-text salary: 0 below the first OFFER_SALARY_TIERS boundary (or unknown)"""
+    value = parse_salary(salary)
+    return bisect_right(current_app.config['OFFER_SALARY_TIERS'], value) if value is not None else 0
+
+
+def allows(best_tier, is_dream, salary):
+    """Whether a student may apply to (or stay in) a drive; best_tier is None for students not yet placed"""
+    return best_tier is None or is_dream or tier(salary) > best_tier
+
+
+def placed_by_season(user_ids=None, seasons=None):
+    """{(user_id, season): tier of their best offer} of students who hold as many offers in a season as the
+    policy allows, over the given seasons (all by default)"""
+    max_offers = current_app.config['OFFER_MAX_OFFERS']
+    if not max_offers:
+        return {}
+    # Served by the (status, user_id) index on applications
+    query = select(Application.user_id, JobPosting.season, JobPosting.salary).join(JobPosting).where(
+        Application.status == 'accepted')
+    if user_ids is not None:
+        query = query.where(Application.user_id.in_(user_ids))
+    if seasons is not None:
+        query = query.where(JobPosting.season.in_(seasons))
+    offers = {}
+    for user_id, season, salary in db.session.execute(query):
+        offers.setdefault((user_id, season), []).append(tier(salary))
+    return {key: max(tiers) for key, tiers in offers.items() if len(tiers) >= max_offers}
+
+
+def placed_students(user_ids=None, season=None):
+    """{user_id: tier of their best offer} of students placed in a season (the current one by default)"""
+    return {user_id: best for (user_id, _), best in placed_by_season(user_ids, [season or current_season()]).items()}
+
+
+def open_drives_clause(user_id):
+    """(WHERE clause on drives joined to their company, seasons the student is placed in): the drives the
+    policy leaves open to a student, each judged by the offers held in its own season"""
+    placed = {season: best for (_, season), best in placed_by_season([user_id]).items()}
+    clauses = []
+    for season, best in placed.items():
+        still_open = [CompanyProfile.is_dream.is_(True)]
+        if current_app.config['OFFER_SALARY_TIERS']:
+            # Salaries are free text, so tiers are worked out here for the season's non-dream drives
+            still_open.append(JobPosting.id.in_([job_id for job_id, salary in db.session.execute(
+                select(JobPosting.id, JobPosting.salary).join(CompanyProfile)
+                .where(JobPosting.season == season, CompanyProfile.is_dream.is_(False))
+            ) if tier(salary) > best]))
+        clauses.append(or_(JobPosting.season != season, *still_open))
+    return and_(true(), *clauses), set(placed)
+
+
+def may_apply(user_id, drive):
+    """Whether the policy lets a student apply to a drive"""
+    return allows(placed_students([user_id], drive.season).get(user_id), drive.company.is_dream, drive.salary)
+
+
+def _withdrawal_filters(placed, season):
+    """WHERE clauses selecting the live applications in a season's drives that the policy withdraws,
+    one per tier and chunk of students"""
+    if not placed:
+        return
+    applied_to = select(Application.job_id).where(Application.status.in_(LIVE_STATUSES),
+                                                  Application.user_id.in_(list(placed)))
+    drive_tiers = {
+        job_id: tier(salary) for job_id, salary in db.session.execute(
+            select(JobPosting.id, JobPosting.salary).join(CompanyProfile)
+            .where(CompanyProfile.is_dream.is_(False), JobPosting.season == season, JobPosting.id.in_(applied_to))
+        )
+    }
+    by_tier = {}
+    for user_id, best_tier in placed.items():
+        by_tier.setdefault(best_tier, []).append(user_id)
+    for best_tier, user_ids in by_tier.items():
+        blocked = [job_id for job_id, drive_tier in drive_tiers.items() if drive_tier <= best_tier]
+        if not blocked:
+            continue
+        for start in range(0, len(user_ids), CHUNK):
+            yield (Application.status.in_(LIVE_STATUSES),
+                   Application.user_id.in_(user_ids[start:start + CHUNK]),
+                   Application.job_id.in_(blocked))
+
+
+def _withdraw(filters):
+    return db.session.execute(
+        update(Application).where(*filters).values(status=WITHDRAWN, updated_at=datetime.utcnow()),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+
+
+def withdraw_other_applications(user_id, season=None):
+    """Withdraw what a newly placed student may no longer pursue in a season (caller commits).
+
+    Returns (application_id, job_id, user_id, company user_id, old status) per
+    withdrawn application, for publishing the changes.
+    """
+    changes = []
+    season = season or current_season()
+    for filters in _withdrawal_filters(placed_students([user_id], season), season):
+        changes += db.session.execute(
+            select(Application.id, Application.job_id, Application.user_id, CompanyProfile.user_id,
+                   Application.status)
+            .join(JobPosting, Application.job_id == JobPosting.id).join(CompanyProfile).where(*filters)
+        ).all()
+        _withdraw(filters)
+    if changes:
+        db.session.execute(delete(InterviewAssignment).where(
+            InterviewAssignment.application_id.in_([change[0] for change in changes])))
+    return changes
+
+
+def reevaluate(season=None):
+    """Apply the policy to a whole season, the current one by default (e.g. after changing it);
+    returns (withdrawn, placed students)"""
+    season = season or current_season()
+    placed = placed_students(season=season)
+    withdrawn = sum(_withdraw(filters) for filters in _withdrawal_filters(placed, season))
+    # Free the interview slots the withdrawn candidates held
+    db.session.execute(delete(InterviewAssignment).where(InterviewAssignment.application_id.in_(
+        select(Application.id).where(Application.status == WITHDRAWN))))
+    db.session.commit()
+    return withdrawn, len(placed)
@@ -0,0 +1,85 @@
+"""Background removal of drives and users with very many child rows.
+
+ON DELETE CASCADE removes children inside the parent's DELETE, which is fine
+for small drives but holds the write lock for the whole cascade on a drive
+with thousands of applications. For those, the drive is hidden immediately
+and its children are deleted here in short batches, each in its own
+transaction, before the drive row itself goes.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import select, delete
+from models import db, User, CompanyProfile, JobPosting, Application, DriveRecommendation
+from tenancy import current_tenant, tenant_context
+
+# One purge at a time: they compete for the same write lock as user requests
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='purge')
+
+
+def needs_background_purge(drive):
+    """Large drives are purged in batches instead of one cascading DELETE"""
+    count = Application.query.filter_by(job_id=drive.id).count()
+    return count > current_app.config['PURGE_BATCH_THRESHOLD']
+
+
+def schedule_drive_purge(drive_id):
+    """Queue a batched purge of a drive already marked pending_deletion"""
+    app = current_app._get_current_object()
+    return executor.submit(_run_in_app_context, app, current_tenant(), purge_drive, drive_id)
+
+
+def _run_in_app_context(app, tenant, func, *args):
+    with tenant_context(tenant), app.app_context():
+        try:
+            return func(*args)
+        except Exception:
+            db.session.rollback()
+            app.logger.exception('Background purge failed: %s%s', func.__name__, args)
+            raise
+
+
+def delete_in_batches(id_column, *criteria):
+    """Delete matching rows batch by batch, committing (and releasing the write lock) in between"""
+    batch_size = current_app.config['PURGE_BATCH_SIZE']
+    pause = current_app.config['PURGE_BATCH_PAUSE']
+    deleted = 0
+    while True:
+        ids = db.session.scalars(select(id_column).where(*criteria).limit(batch_size)).all()
+        if not ids:
+            return deleted
+        db.session.execute(delete(id_column.class_).where(id_column.in_(ids)))
+        db.session.commit()
+        deleted += len(ids)
+        time.sleep(pause)  # Let queued writers in between batches
+
+
+def purge_drive(drive_id):
+    """Remove a drive's applications in batches, then the drive itself"""
+    deleted = delete_in_batches(Application.id, Application.job_id == drive_id)
+    db.session.execute(delete(DriveRecommendation).where(DriveRecommendation.job_id == drive_id))
+    db.session.execute(delete(JobPosting).where(JobPosting.id == drive_id))
+    db.session.commit()
+    current_app.logger.info('Purged drive %s and %s applications', drive_id, deleted)
+    return deleted
+
+
+def purge_user(user_id):
+    """Remove a user, their applications and (for companies) their drives in batches"""
+    deleted = delete_in_batches(Application.id, Application.user_id == user_id)
+    drive_ids = db.session.scalars(
+        select(JobPosting.id).join(CompanyProfile).where(CompanyProfile.user_id == user_id)
+    ).all()
+    for drive_id in drive_ids:
+        deleted += purge_drive(drive_id)
+    db.session.execute(delete(User).where(User.id == user_id))  # Profiles and recommendations cascade
+    db.session.commit()
+    return deleted
+
+
+def purge_pending_drives():
+    """Finish purges interrupted by a restart"""
+    drive_ids = db.session.scalars(select(JobPosting.id).filter_by(pending_deletion=True)).all()
+    for drive_id in drive_ids:
+        purge_drive(drive_id)
+    return drive_ids
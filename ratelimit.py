@@ -0,0 +1,120 @@
+import threading
+import time
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+
+def parse_limit(limit):
+    """Parse a limit such as '10/minute' into (tokens per second, bucket capacity)"""
+    count, _, period = limit.partition('/')
+    count = int(count)
+    return count / PERIODS[period.strip()], count
+
+
+class MemoryBackend:
+    """Per-process token buckets kept in a dictionary"""
+
+    def __init__(self, max_keys=100000):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def consume(self, buckets, cost=1):
+        """Take tokens from every (key, rate, capacity) bucket, or from none; returns (allowed, seconds until retry)"""
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for key, rate, capacity in buckets:
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                levels.append(min(capacity, tokens + (now - updated) * rate))
+            waits = [(cost - tokens) / rate for tokens, (_, rate, _) in zip(levels, buckets) if tokens < cost]
+            taken = 0 if waits else cost
+            for tokens, (key, _, _) in zip(levels, buckets):
+                self._buckets[key] = (tokens - taken, now)
+            if len(self._buckets) > self._max_keys:
+                self._prune(now, max(capacity / rate for _, rate, capacity in buckets))
+        return (False, max(waits)) if waits else (True, 0)
+
+    def _prune(self, now, idle):
+        # Buckets idle long enough to have refilled carry no state worth keeping
+        stale = [key for key, (_, updated) in self._buckets.items() if now - updated > idle]
+        for key in stale:
+            del self._buckets[key]
+
+
+class RedisBackend:
+    """Token buckets shared by all workers, stored in Redis"""
+
+    # Every bucket is refilled and checked before any is charged, so a rejection costs no tokens
+    SCRIPT = """
+    local now, cost = tonumber(ARGV[1]), tonumber(ARGV[2])
+    local levels, wait = {}, 0
+    for i, key in ipairs(KEYS) do
+        local rate, capacity = tonumber(ARGV[2 * i + 1]), tonumber(ARGV[2 * i + 2])
+        local tokens = tonumber(redis.call('HGET', key, 'tokens') or capacity)
+        local updated = tonumber(redis.call('HGET', key, 'updated') or now)
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        levels[i] = tokens
+        if tokens < cost then
+            wait = math.max(wait, (cost - tokens) / rate)
+        end
+    end
+    local taken = 0
+    if wait == 0 then
+        taken = cost
+    end
+    for i, key in ipairs(KEYS) do
+        local rate, capacity = tonumber(ARGV[2 * i + 1]), tonumber(ARGV[2 * i + 2])
+        redis.call('HSET', key, 'tokens', levels[i] - taken, 'updated', now)
+        redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+    end
+    return tostring(wait)
+    """
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('The redis package is required for RATELIMIT_STORAGE_URL=redis://...') from e
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def consume(self, buckets, cost=1):
+        """Take tokens from every (key, rate, capacity) bucket, or from none; returns (allowed, seconds until retry)"""
+        args = [time.time(), cost]
+        for _, rate, capacity in buckets:
+            args += [rate, capacity]
+        wait = float(self._script(keys=[key for key, _, _ in buckets], args=args))
+        return wait == 0, wait
+
+
+class ConcurrencyLimiter:
+    """Caps how many requests an endpoint may process at once in this worker"""
+
+    def __init__(self):
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key, limit):
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = self._semaphores[key] = threading.BoundedSemaphore(limit)
+        if semaphore.acquire(blocking=False):
+            return semaphore
+        return None
+
+
+def create_backend(url):
+    """Pick a bucket backend from RATELIMIT_STORAGE_URL"""
+    if not url or url == 'memory://':
+        return MemoryBackend()
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisBackend(url)
+    raise ValueError(f'Unsupported rate limit storage: {url}')
+
+
+def init_app(app):
+    """Attach the rate limit backend and concurrency limiter to the app"""
+    app.extensions['ratelimit'] = create_backend(app.config.get('RATELIMIT_STORAGE_URL'))
+    app.extensions['concurrency'] = ConcurrencyLimiter()
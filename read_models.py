@@ -0,0 +1,55 @@
+"""Read-only row projections for list pages.
+
+List views only print a handful of columns, so instead of loading full ORM
+objects (identity map, change tracking, Text columns like cover_letter and
+description) they select just the rendered columns into namedtuples.
+"""
+from collections import namedtuple
+from sqlalchemy import select, or_
+from models import db, User, StudentProfile, CompanyProfile, JobPosting, Application
+
+ApplicationRow = namedtuple('ApplicationRow', 'id username job_title company_name applied_at status')
+StudentRow = namedtuple('StudentRow', 'id user_id full_name roll_number branch cgpa email is_active')
+ApplicantRow = namedtuple('ApplicantRow', 'id username email applied_at status')
+
+
+def applications_query():
+    """Every application with its student, drive and company names"""
+    return select(
+        Application.id, User.username, JobPosting.title, CompanyProfile.company_name,
+        Application.applied_at, Application.status
+    ).join(User, Application.user_id == User.id).join(
+        JobPosting, Application.job_id == JobPosting.id
+    ).join(CompanyProfile, JobPosting.company_id == CompanyProfile.id).order_by(Application.id)
+
+
+def students_query(search=''):
+    """Student profiles with their account email and status, optionally filtered"""
+    query = select(
+        StudentProfile.id, StudentProfile.user_id, StudentProfile.full_name, StudentProfile.roll_number,
+        StudentProfile.branch, StudentProfile.cgpa, User.email, User.is_active
+    ).join(User, StudentProfile.user_id == User.id).order_by(StudentProfile.id)
+    if search:
+        query = query.filter(
+            or_(
+                StudentProfile.full_name.ilike(f'%{search}%'),
+                StudentProfile.roll_number.ilike(f'%{search}%'),
+                StudentProfile.branch.ilike(f'%{search}%'),
+                User.email.ilike(f'%{search}%')
+            )
+        )
+    return query
+
+
+def applicants_query(drive_id):
+    """Applicants of one drive, newest first"""
+    return select(
+        Application.id, User.username, User.email, Application.applied_at, Application.status
+    ).join(User, Application.user_id == User.id).filter(
+        Application.job_id == drive_id
+    ).order_by(Application.applied_at.desc())
+
+
+def fetch(row_type, query):
+    """Run a projection query and return compact row tuples"""
+    return [row_type._make(row) for row in db.session.execute(query).tuples()]
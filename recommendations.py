@@ -0,0 +1,148 @@
+"""Drive recommendations for students.
+
+A periodic batch job scores every (student, open drive) pair with NumPy and
+stores each student's top-K drives in drive_recommendations. The
+recommended drives page reads them back with a single indexed query.
+
+Score = keyword overlap between the student (branch + drives applied to)
+        and the drive's title/requirements
+      + whether the drive asks for the student's branch
+      + how often the student applies to this job type.
+Drives the student is not eligible for (CGPA below the minimum mentioned in
+the requirements) or has already applied to are never recommended.
+"""
+import re
+from datetime import datetime
+import numpy as np
+from sqlalchemy import select, delete, insert
+from models import db, StudentProfile, JobPosting, Application, DriveRecommendation
+
+TOP_K = 10
+CHUNK_SIZE = 2048  # Students scored per matrix block, bounds peak memory
+WEIGHTS = {'keywords': 0.5, 'branch': 0.3, 'history': 0.2}
+OPEN_TO_ALL_BRANCHES = 0.5  # Branch score for drives that name no branch
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9+#]+')
+CGPA_PATTERN = re.compile(r'cgpa\D{0,20}?(\d{1,2}(?:\.\d+)?)', re.IGNORECASE)
+STOPWORDS = frozenset(
+    'a an and are as at be by for from good in is knowledge min minimum of on or required '
+    'requirements should strong student students the to with cgpa experience'.split()
+)
+
+
+def tokenize(text):
+    """Lowercase keyword set of a piece of text"""
+    return set(TOKEN_PATTERN.findall((text or '').lower())) - STOPWORDS
+
+
+def minimum_cgpa(requirements):
+    """Minimum CGPA mentioned in a drive's requirements (0 when none is given)"""
+    match = CGPA_PATTERN.search(requirements or '')
+    return float(match.group(1)) if match else 0.0
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def compute_recommendations(top_k=TOP_K):
+    """Rebuild drive_recommendations for every student; returns the number of rows written"""
+    now = datetime.now()
+    drives = db.session.execute(select(
+        JobPosting.id, JobPosting.title, JobPosting.requirements, JobPosting.job_type,
+        JobPosting.is_active, JobPosting.is_approved, JobPosting.deadline,
+    )).all()
+    students = db.session.execute(select(
+        StudentProfile.user_id, StudentProfile.branch, StudentProfile.cgpa,
+    ).order_by(StudentProfile.user_id)).all()
+    applied = db.session.execute(select(Application.user_id, Application.job_id)).all()
+
+    rows = _score(drives, students, applied, now, top_k) if drives and students else []
+
+    # Swap the whole table in one transaction so readers never see a partial list
+    db.session.execute(delete(DriveRecommendation))
+    if rows:
+        db.session.execute(insert(DriveRecommendation), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def _score(drives, students, applied, now, top_k):
+    # Drive features: keyword matrix, job type one-hot, branch mentions, minimum CGPA
+    drive_index = {drive.id: i for i, drive in enumerate(drives)}
+    drive_tokens = [tokenize(f'{drive.title} {drive.requirements}') for drive in drives]
+    vocabulary = {token: i for i, token in enumerate(sorted(set().union(*drive_tokens)))}
+    keywords = np.zeros((len(drives), len(vocabulary)), dtype=np.float32)
+    for i, tokens in enumerate(drive_tokens):
+        keywords[i, [vocabulary[token] for token in tokens]] = 1
+
+    job_types = {job_type: i for i, job_type in enumerate(sorted({d.job_type for d in drives}))}
+    types = np.zeros((len(drives), len(job_types)), dtype=np.float32)
+    types[np.arange(len(drives)), [job_types[d.job_type] for d in drives]] = 1
+
+    is_open = np.array([bool(d.is_active and d.is_approved and d.deadline >= now) for d in drives])
+    open_cols = np.flatnonzero(is_open)
+    if not len(open_cols):
+        return []
+    open_keywords = _normalize_rows(keywords)[open_cols]
+    open_types = types[open_cols]
+    open_min_cgpa = np.array([minimum_cgpa(drives[i].requirements) for i in open_cols],
+                             dtype=np.float32)
+
+    branches = {branch: i for i, branch in enumerate(sorted({s.branch for s in students}))}
+    requirements = [(drives[i].requirements or '').lower() for i in open_cols]
+    branch_match = np.array([[branch.lower() in text for text in requirements] for branch in branches],
+                            dtype=np.float32)
+    branch_match[:, branch_match.sum(axis=0) == 0] = OPEN_TO_ALL_BRANCHES
+    branch_keywords = np.zeros((len(branches), len(vocabulary)), dtype=np.float32)
+    for branch, i in branches.items():
+        branch_keywords[i, [vocabulary[t] for t in tokenize(branch) if t in vocabulary]] = 1
+
+    # Student features
+    user_ids = np.array([s.user_id for s in students], dtype=np.int64)
+    student_branch = np.array([branches[s.branch] for s in students])
+    cgpa = np.array([s.cgpa for s in students], dtype=np.float32)
+    student_index = {user_id: i for i, user_id in enumerate(user_ids.tolist())}
+    applied = [(student_index[u], drive_index[j]) for u, j in applied
+               if u in student_index and j in drive_index]
+    applied_rows = np.array([r for r, _ in applied], dtype=np.int64)
+    applied_cols = np.array([c for _, c in applied], dtype=np.int64)
+
+    rows = []
+    computed_at = datetime.utcnow()
+    for lo in range(0, len(students), CHUNK_SIZE):
+        hi = min(lo + CHUNK_SIZE, len(students))
+        in_chunk = (applied_rows >= lo) & (applied_rows < hi)
+        history = np.zeros((hi - lo, len(drives)), dtype=np.float32)
+        history[applied_rows[in_chunk] - lo, applied_cols[in_chunk]] = 1
+
+        chunk_branch = student_branch[lo:hi]
+        profile = branch_keywords[chunk_branch] + 0.5 * _normalize_rows(history @ keywords)
+        keyword_score = _normalize_rows(profile) @ open_keywords.T
+
+        type_counts = history @ types
+        type_share = type_counts / np.maximum(type_counts.sum(axis=1, keepdims=True), 1)
+        history_score = type_share @ open_types.T
+
+        score = (WEIGHTS['keywords'] * keyword_score
+                 + WEIGHTS['branch'] * branch_match[chunk_branch]
+                 + WEIGHTS['history'] * history_score)
+        score[cgpa[lo:hi, None] < open_min_cgpa[None, :]] = -np.inf
+        score[history[:, open_cols] > 0] = -np.inf
+
+        k = min(top_k, len(open_cols))
+        best = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(score, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        for offset, (cols, scores) in enumerate(zip(best, best_scores)):
+            user_id = int(user_ids[lo + offset])
+            for rank, (col, value) in enumerate(zip(cols, scores), start=1):
+                if not np.isfinite(value):
+                    break
+                rows.append({'user_id': user_id, 'rank': rank, 'job_id': int(drives[open_cols[col]].id),
+                             'score': round(float(value), 4), 'computed_at': computed_at})
+    return rows
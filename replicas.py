@@ -0,0 +1,108 @@
+import random
+import sqlite3
+import time
+from flask import g, has_request_context, session, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from tenancy import TENANT_BIND_PREFIX, current_tenant
+
+REPLICA_BIND_PREFIX = 'replica_'
+PRIMARY_PIN_KEY = '_primary_until'
+
+
+def replica_binds(uris):
+    """Build SQLALCHEMY_BINDS entries for a list of replica database URLs"""
+    return {f'{REPLICA_BIND_PREFIX}{i}': uri for i, uri in enumerate(uris)}
+
+
+class RoutingSession(Session):
+    """Session that sends queries to the current tenant's database, and reads
+    to a replica when the current request allows it.
+
+    Writes, flushes and anything touching a non-default bind always go to the
+    engine Flask-SQLAlchemy would normally pick.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        engines = self._db.engines
+        tenant = current_tenant()
+        if tenant and bind is None and primary in (engines.get(None), engines.get('archive')):
+            # Tenant databases hold the hot and archive tables; replicas are primary-only
+            return engines[f'{TENANT_BIND_PREFIX}{tenant}']
+        if bind is not None or not self._can_use_replica():
+            return primary
+
+        if primary is not engines.get(None):
+            return primary
+
+        replicas = [engine for key, engine in engines.items()
+                    if key and key.startswith(REPLICA_BIND_PREFIX)]
+        if not replicas:
+            return primary
+        return random.choice(replicas)
+
+    def _can_use_replica(self):
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        if self.info.get('wrote'):
+            return False
+        return has_request_context() and g.get('use_replica', False)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _flag_flush(db_session, flush_context):
+    db_session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _flag_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_after_commit(db_session):
+    if db_session.info.pop('wrote', False):
+        mark_primary_sticky()
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _clear_after_rollback(db_session):
+    db_session.info.pop('wrote', None)
+
+
+def mark_primary_sticky():
+    """Pin the current user's reads to the primary for a short while (read-your-writes)"""
+    if not has_request_context() or not current_app.config.get('SQLALCHEMY_REPLICA_URIS'):
+        return
+    session[PRIMARY_PIN_KEY] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+
+
+def is_pinned_to_primary():
+    """Check whether the current user wrote recently and must read from the primary"""
+    return session.get(PRIMARY_PIN_KEY, 0) > time.time()
+
+
+def sync_sqlite_replicas(db):
+    """Refresh local SQLite replica copies from the primary using the online backup API"""
+    primary = db.engines[None]
+    if primary.dialect.name != 'sqlite':
+        raise RuntimeError('Replica sync is only supported for SQLite databases.')
+
+    synced = []
+    source = sqlite3.connect(primary.url.database)
+    try:
+        for key, engine in db.engines.items():
+            if not key or not key.startswith(REPLICA_BIND_PREFIX):
+                continue
+            engine.dispose()
+            target = sqlite3.connect(engine.url.database)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+            synced.append(engine.url.database)
+    finally:
+        source.close()
+    return synced
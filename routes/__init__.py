@@ -0,0 +1 @@
+"""Blueprints for the portal's public pages and its admin, student and company areas"""
@@ -0,0 +1,227 @@
+"""Admin area: approvals, user management, drive and application oversight, analytics"""
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, Response
+from sqlalchemy import or_
+import csv
+import io
+import read_models
+from models import db, User, CompanyProfile, JobPosting, Application, ArchivedJobPosting
+from decorators import admin_required, read_replica
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/admin')
+@admin_required
+@read_replica
+def admin_panel():
+    """Admin panel - admin only with statistics"""
+    # Get statistics
+    total_users = User.query.count()
+    total_students = User.query.filter_by(role='student').count()
+    total_companies = User.query.filter_by(role='company').count()
+    approved_companies = User.query.filter_by(role='company', is_approved=True).count()
+    pending_companies = User.query.filter_by(role='company', is_approved=False).count()
+    
+    total_drives = JobPosting.query.count()
+    approved_drives = JobPosting.query.filter_by(is_approved=True).count()
+    pending_drives = JobPosting.query.filter_by(is_approved=False).count()
+    
+    total_applications = Application.query.count()
+    
+    stats = {
+        'total_users': total_users,
+        'total_students': total_students,
+        'total_companies': total_companies,
+        'approved_companies': approved_companies,
+        'pending_companies': pending_companies,
+        'total_drives': total_drives,
+        'approved_drives': approved_drives,
+        'pending_drives': pending_drives,
+        'total_applications': total_applications
+    }
+    
+    return render_template('admin.html', stats=stats)
+
+@bp.route('/admin/companies')
+@admin_required
+@read_replica
+def admin_companies():
+    """View all companies"""
+    search = request.args.get('search', '')
+    if search:
+        companies = CompanyProfile.query.join(User).filter(
+            or_(
+                CompanyProfile.company_name.ilike(f'%{search}%'),
+                CompanyProfile.industry.ilike(f'%{search}%'),
+                User.email.ilike(f'%{search}%')
+            )
+        ).all()
+    else:
+        companies = CompanyProfile.query.all()
+    
+    return render_template('admin_companies.html', companies=companies, search=search)
+
+@bp.route('/admin/company/approve/<int:user_id>')
+@admin_required
+def approve_company(user_id):
+    """Approve a company"""
+    user = User.query.get_or_404(user_id)
+    if user.role != 'company':
+        flash('Invalid user type.', 'danger')
+        return redirect(url_for('admin.admin_companies'))
+    
+    user.is_approved = True
+    db.session.commit()
+    flash(f'Company {user.username} approved successfully!', 'success')
+    return redirect(url_for('admin.admin_companies'))
+
+@bp.route('/admin/company/reject/<int:user_id>')
+@admin_required
+def reject_company(user_id):
+    """Reject a company"""
+    user = User.query.get_or_404(user_id)
+    if user.role != 'company':
+        flash('Invalid user type.', 'danger')
+        return redirect(url_for('admin.admin_companies'))
+    
+    user.is_approved = False
+    db.session.commit()
+    flash(f'Company {user.username} rejected.', 'warning')
+    return redirect(url_for('admin.admin_companies'))
+
+@bp.route('/admin/company/dream/<int:user_id>')
+@admin_required
+def toggle_dream_company(user_id):
+    """Flag or unflag a dream company (its drives stay open to placed students)"""
+    user = User.query.get_or_404(user_id)
+    if user.role != 'company' or not user.company_profile:
+        flash('Invalid user type.', 'danger')
+        return redirect(url_for('admin.admin_companies'))
+    
+    user.company_profile.is_dream = not user.company_profile.is_dream
+    db.session.commit()
+    if user.company_profile.is_dream:
+        flash(f'{user.company_profile.company_name} is now a dream company.', 'success')
+    else:
+        flash(f'{user.company_profile.company_name} is no longer a dream company.', 'warning')
+    return redirect(url_for('admin.admin_companies'))
+
+@bp.route('/admin/students')
+@admin_required
+@read_replica
+def admin_students():
+    """View all students"""
+    search = request.args.get('search', '')
+    students = read_models.fetch(read_models.StudentRow, read_models.students_query(search))
+    
+    return render_template('admin_students.html', students=students, search=search)
+
+@bp.route('/admin/drives')
+@admin_required
+@read_replica
+def admin_drives():
+    """View all drives (job postings)"""
+    search = request.args.get('search', '')
+    if search:
+        drives = JobPosting.query.filter_by(pending_deletion=False).join(CompanyProfile).filter(
+            or_(
+                JobPosting.title.ilike(f'%{search}%'),
+                JobPosting.location.ilike(f'%{search}%'),
+                CompanyProfile.company_name.ilike(f'%{search}%')
+            )
+        ).all()
+    else:
+        drives = JobPosting.query.filter_by(pending_deletion=False).all()
+    
+    # Closed seasons live in the archive tables and are only searched on request
+    include_archived = request.args.get('archived') == '1'
+    archived_drives = []
+    if include_archived:
+        archived_query = ArchivedJobPosting.query
+        if search:
+            archived_query = archived_query.filter(
+                or_(
+                    ArchivedJobPosting.title.ilike(f'%{search}%'),
+                    ArchivedJobPosting.location.ilike(f'%{search}%'),
+                    ArchivedJobPosting.company_name.ilike(f'%{search}%')
+                )
+            )
+        archived_drives = archived_query.order_by(ArchivedJobPosting.posted_at.desc()).all()
+    
+    return render_template('admin_drives.html', drives=drives, search=search,
+                         include_archived=include_archived, archived_drives=archived_drives)
+
+@bp.route('/admin/drive/approve/<int:drive_id>')
+@admin_required
+def approve_drive(drive_id):
+    """Approve a drive"""
+    drive = JobPosting.query.get_or_404(drive_id)
+    drive.is_approved = True
+    db.session.commit()
+    flash(f'Drive "{drive.title}" approved successfully!', 'success')
+    return redirect(url_for('admin.admin_drives'))
+
+@bp.route('/admin/drive/reject/<int:drive_id>')
+@admin_required
+def reject_drive(drive_id):
+    """Reject a drive"""
+    drive = JobPosting.query.get_or_404(drive_id)
+    drive.is_approved = False
+    db.session.commit()
+    flash(f'Drive "{drive.title}" rejected.', 'warning')
+    return redirect(url_for('admin.admin_drives'))
+
+@bp.route('/admin/applications')
+@admin_required
+@read_replica
+def admin_applications():
+    """View all applications"""
+    applications = read_models.fetch(read_models.ApplicationRow, read_models.applications_query())
+    return render_template('admin_applications.html', applications=applications)
+
+@bp.route('/admin/analytics')
+@admin_required
+@read_replica
+def admin_analytics():
+    """Placement analytics reports"""
+    import analytics  # NumPy is only loaded by workers that serve the analytics
+    reports = analytics.get_reports()
+    return render_template('admin_analytics.html', reports=reports.values())
+
+@bp.route('/admin/analytics/<report>.csv')
+@admin_required
+@read_replica
+def admin_analytics_csv(report):
+    """Download an analytics report as CSV"""
+    import analytics
+    if report not in analytics.REPORTS:
+        abort(404)
+    data = analytics.get_reports()[report]
+    
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(data['columns'])
+    writer.writerows(data['rows'])
+    return Response(output.getvalue(), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={report}.csv'})
+
+@bp.route('/admin/user/toggle/<int:user_id>')
+@admin_required
+def toggle_user(user_id):
+    """Activate/Deactivate (blacklist) a user"""
+    user = User.query.get_or_404(user_id)
+    if user.role == 'admin':
+        flash('Cannot deactivate admin users.', 'danger')
+        return redirect(url_for('admin.admin_panel'))
+    
+    user.is_active = not user.is_active
+    db.session.commit()
+    status = 'activated' if user.is_active else 'deactivated'
+    flash(f'User {user.username} {status} successfully!', 'success')
+    
+    # Redirect to appropriate page based on role
+    if user.role == 'company':
+        return redirect(url_for('admin.admin_companies'))
+    elif user.role == 'student':
+        return redirect(url_for('admin.admin_students'))
+    else:
+        return redirect(url_for('admin.admin_panel'))
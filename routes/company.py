@@ -0,0 +1,506 @@
+"""Company area: profile, drives, applicants and interview scheduling"""
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import current_user
+from sqlalchemy import exists
+from sqlalchemy.orm import joinedload
+from datetime import datetime
+import purge
+import read_models
+import events
+import interviews
+import policy
+from models import (db, StudentProfile, CompanyProfile, JobPosting, Application, InterviewPanel,
+                    InterviewSlot, InterviewAssignment)
+from decorators import company_required, read_replica
+
+bp = Blueprint('company', __name__)
+
+@bp.route('/company/profile')
+@company_required
+def company_profile():
+    """Company profile page - company only"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    return render_template('company_profile.html', profile=profile)
+
+@bp.route('/company/dashboard')
+@company_required
+@read_replica
+def company_dashboard():
+    """Company dashboard with statistics"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    
+    if profile:
+        # Get company's drives statistics
+        total_drives = JobPosting.query.filter_by(company_id=profile.id).count()
+        active_drives = JobPosting.query.filter_by(company_id=profile.id, is_active=True).count()
+        approved_drives = JobPosting.query.filter_by(company_id=profile.id, is_approved=True).count()
+        pending_drives = JobPosting.query.filter_by(company_id=profile.id, is_approved=False).count()
+        
+        # Get total applications for company's drives
+        total_applications = db.session.query(Application).join(JobPosting).filter(
+            JobPosting.company_id == profile.id
+        ).count()
+        
+        # Get applications by status
+        pending_applications = db.session.query(Application).join(JobPosting).filter(
+            JobPosting.company_id == profile.id,
+            Application.status == 'pending'
+        ).count()
+        
+        shortlisted_applications = db.session.query(Application).join(JobPosting).filter(
+            JobPosting.company_id == profile.id,
+            Application.status == 'shortlisted'
+        ).count()
+        
+        stats = {
+            'total_drives': total_drives,
+            'active_drives': active_drives,
+            'approved_drives': approved_drives,
+            'pending_drives': pending_drives,
+            'total_applications': total_applications,
+            'pending_applications': pending_applications,
+            'shortlisted_applications': shortlisted_applications
+        }
+    else:
+        stats = {
+            'total_drives': 0,
+            'active_drives': 0,
+            'approved_drives': 0,
+            'pending_drives': 0,
+            'total_applications': 0,
+            'pending_applications': 0,
+            'shortlisted_applications': 0
+        }
+    
+    return render_template('company_dashboard.html', profile=profile, stats=stats)
+
+@bp.route('/company/drive/create', methods=['GET', 'POST'])
+@company_required
+def create_drive():
+    """Create a new placement drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    
+    if not profile:
+        flash('Please complete your company profile first.', 'warning')
+        return redirect(url_for('company.company_profile'))
+    
+    if not current_user.is_approved:
+        flash('Your company account needs admin approval before posting drives.', 'warning')
+        return redirect(url_for('company.company_dashboard'))
+    
+    if request.method == 'POST':
+        title = request.form.get('title')
+        description = request.form.get('description')
+        requirements = request.form.get('requirements')
+        salary = request.form.get('salary')
+        location = request.form.get('location')
+        job_type = request.form.get('job_type')
+        deadline_str = request.form.get('deadline')
+        
+        # Validation
+        if not all([title, description, requirements, location, job_type, deadline_str]):
+            flash('All required fields must be filled.', 'danger')
+            return render_template('create_drive.html', profile=profile)
+        
+        # Validate length limits
+        if len(title) > 200:
+            flash('Job title must not exceed 200 characters.', 'danger')
+            return render_template('create_drive.html', profile=profile)
+        
+        if len(description) > 2000 or len(requirements) > 2000:
+            flash('Description and requirements must not exceed 2000 characters each.', 'danger')
+            return render_template('create_drive.html', profile=profile)
+        
+        try:
+            deadline = datetime.strptime(deadline_str, '%Y-%m-%d')
+            
+            # Check if deadline is in the future
+            if deadline.date() < datetime.now().date():
+                flash('Deadline cannot be in the past.', 'danger')
+                return render_template('create_drive.html', profile=profile)
+            
+            # Create new drive
+            new_drive = JobPosting(
+                company_id=profile.id,
+                title=title,
+                description=description,
+                requirements=requirements,
+                salary=salary,
+                location=location,
+                job_type=job_type,
+                deadline=deadline,
+                is_active=True,
+                is_approved=False  # Requires admin approval
+            )
+            
+            db.session.add(new_drive)
+            db.session.commit()
+            
+            flash('Drive created successfully! Waiting for admin approval.', 'success')
+            return redirect(url_for('company.company_drives'))
+        except ValueError:
+            flash('Invalid date format.', 'danger')
+            return render_template('create_drive.html', profile=profile)
+    
+    return render_template('create_drive.html', profile=profile)
+
+@bp.route('/company/drives')
+@company_required
+@read_replica
+def company_drives():
+    """View all company drives"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    
+    if profile:
+        drives = JobPosting.query.filter_by(company_id=profile.id, pending_deletion=False).order_by(JobPosting.posted_at.desc()).all()
+    else:
+        drives = []
+    
+    return render_template('company_drives.html', profile=profile, drives=drives)
+
+@bp.route('/company/drive/edit/<int:drive_id>', methods=['GET', 'POST'])
+@company_required
+def edit_drive(drive_id):
+    """Edit a placement drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check ownership
+    if drive.company_id != profile.id:
+        flash('You do not have permission to edit this drive.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    if request.method == 'POST':
+        title = request.form.get('title')
+        description = request.form.get('description')
+        requirements = request.form.get('requirements')
+        salary = request.form.get('salary')
+        location = request.form.get('location')
+        job_type = request.form.get('job_type')
+        deadline_str = request.form.get('deadline')
+        
+        # Validation
+        if not all([title, description, requirements, location, job_type, deadline_str]):
+            flash('All required fields must be filled.', 'danger')
+            return render_template('edit_drive.html', profile=profile, drive=drive)
+        
+        # Validate length limits
+        if len(title) > 200:
+            flash('Job title must not exceed 200 characters.', 'danger')
+            return render_template('edit_drive.html', profile=profile, drive=drive)
+        
+        if len(description) > 2000 or len(requirements) > 2000:
+            flash('Description and requirements must not exceed 2000 characters each.', 'danger')
+            return render_template('edit_drive.html', profile=profile, drive=drive)
+        
+        try:
+            new_deadline = datetime.strptime(deadline_str, '%Y-%m-%d')
+            
+            # Check if deadline is in the future
+            if new_deadline.date() < datetime.now().date():
+                flash('Deadline cannot be in the past.', 'danger')
+                return render_template('edit_drive.html', profile=profile, drive=drive)
+            
+            # Update drive
+            drive.title = title
+            drive.description = description
+            drive.requirements = requirements
+            drive.salary = salary
+            drive.location = location
+            drive.job_type = job_type
+            drive.deadline = new_deadline
+            
+            db.session.commit()
+            flash('Drive updated successfully!', 'success')
+            return redirect(url_for('company.company_drives'))
+        except ValueError:
+            flash('Invalid date format.', 'danger')
+    
+    return render_template('edit_drive.html', profile=profile, drive=drive)
+
+@bp.route('/company/drive/delete/<int:drive_id>')
+@company_required
+def delete_drive(drive_id):
+    """Delete a placement drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check ownership
+    if drive.company_id != profile.id:
+        flash('You do not have permission to delete this drive.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    if purge.needs_background_purge(drive):
+        # Hide it now; applications are removed in small batches in the background
+        drive.is_active = False
+        drive.pending_deletion = True
+        db.session.commit()
+        purge.schedule_drive_purge(drive.id)
+        flash('Drive is being deleted. This may take a moment for drives with many applicants.', 'info')
+        return redirect(url_for('company.company_drives'))
+    
+    # Applications are removed by ON DELETE CASCADE in the same statement
+    db.session.delete(drive)
+    db.session.commit()
+    flash('Drive deleted successfully!', 'success')
+    return redirect(url_for('company.company_drives'))
+
+@bp.route('/company/drive/toggle/<int:drive_id>')
+@company_required
+def toggle_drive(drive_id):
+    """Close/Open a placement drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check ownership
+    if drive.company_id != profile.id:
+        flash('You do not have permission to modify this drive.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    drive.is_active = not drive.is_active
+    db.session.commit()
+    
+    status = 'opened' if drive.is_active else 'closed'
+    flash(f'Drive "{drive.title}" {status} successfully!', 'success')
+    return redirect(url_for('company.company_drives'))
+
+@bp.route('/company/drive/<int:drive_id>/applicants')
+@company_required
+@read_replica
+def view_applicants(drive_id):
+    """View applicants for a specific drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check ownership
+    if drive.company_id != profile.id:
+        flash('You do not have permission to view these applicants.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    # Get all applications for this drive with student details
+    applications = read_models.fetch(read_models.ApplicantRow, read_models.applicants_query(drive_id))
+    
+    return render_template('view_applicants.html', profile=profile, drive=drive, applications=applications)
+
+@bp.route('/company/application/<int:application_id>/update-status', methods=['POST'])
+@company_required
+def update_application_status(application_id):
+    """Update application status"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    application = Application.query.get_or_404(application_id)
+    
+    # Check ownership through drive
+    if application.job.company_id != profile.id:
+        flash('You do not have permission to update this application.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    new_status = request.form.get('status')
+    if application.status == policy.WITHDRAWN:
+        flash('This application was withdrawn because the student has accepted another offer.', 'warning')
+    elif new_status in ['pending', 'reviewed', 'shortlisted', 'rejected', 'accepted']:
+        old_status = application.status
+        application.status = new_status
+        # An accepted offer withdraws the student's other applications in the same transaction
+        withdrawn = []
+        if new_status == 'accepted' and old_status != 'accepted':
+            withdrawn = policy.withdraw_other_applications(application.user_id, application.job.season)
+        # Off the shortlist: its upcoming interview slot goes back to the pool
+        if old_status == 'shortlisted' and new_status != 'shortlisted':
+            interviews.release_slots([application.id])
+        db.session.commit()
+        events.status_changes(current_user.id, [
+            (application.id, application.job_id, application.user_id, old_status, new_status)
+        ])
+        by_company = {}
+        for application_id, job_id, user_id, company_user_id, previous in withdrawn:
+            by_company.setdefault(company_user_id, []).append(
+                (application_id, job_id, user_id, previous, policy.WITHDRAWN))
+        for company_user_id, changes in by_company.items():
+            events.status_changes(company_user_id, changes)
+        flash(f'Application status updated to {new_status}.', 'success')
+        if withdrawn:
+            flash(f"The student's {len(withdrawn)} other application(s) were withdrawn under the placement policy.",
+                  'info')
+    else:
+        flash('Invalid status.', 'danger')
+    
+    return redirect(url_for('company.view_applicants', drive_id=application.job_id))
+
+@bp.route('/company/drive/<int:drive_id>/shortlist', methods=['POST'])
+@company_required
+def shortlist_applicants(drive_id):
+    """Shortlist multiple applicants"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check ownership
+    if drive.company_id != profile.id:
+        flash('You do not have permission to modify these applications.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    application_ids = request.form.getlist('application_ids')
+    
+    if application_ids:
+        # Bulk update for better performance
+        app_ids_int = [int(app_id) for app_id in application_ids]
+        selected = Application.query.filter(
+            Application.id.in_(app_ids_int),
+            Application.job_id == drive_id,
+            Application.status != policy.WITHDRAWN
+        )
+        previous = selected.with_entities(Application.id, Application.user_id, Application.status).all()
+        count = selected.update({Application.status: 'shortlisted'}, synchronize_session=False)
+        
+        db.session.commit()
+        events.status_changes(current_user.id, [
+            (application_id, drive_id, user_id, old_status, 'shortlisted')
+            for application_id, user_id, old_status in previous
+        ])
+        flash(f'{count} applicant(s) shortlisted successfully!', 'success')
+    else:
+        flash('No applicants selected.', 'warning')
+    
+    return redirect(url_for('company.view_applicants', drive_id=drive_id))
+
+@bp.route('/company/drive/<int:drive_id>/interviews')
+@company_required
+def manage_interviews(drive_id):
+    """Interview panels, slots and the schedule of a drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check ownership
+    if drive.company_id != profile.id:
+        flash('You do not have permission to manage these interviews.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    panels = InterviewPanel.query.filter_by(job_id=drive_id).options(
+        joinedload(InterviewPanel.slots)
+    ).order_by(InterviewPanel.id).all()
+    scheduled = {
+        row.slot_id: row for row in db.session.execute(
+            db.select(InterviewAssignment.slot_id, StudentProfile.full_name, StudentProfile.roll_number)
+            .join(StudentProfile, StudentProfile.user_id == InterviewAssignment.user_id)
+            .where(InterviewAssignment.job_id == drive_id)
+        )
+    }
+    unscheduled = db.session.execute(
+        db.select(Application.id, StudentProfile.full_name, StudentProfile.roll_number)
+        .join(StudentProfile, StudentProfile.user_id == Application.user_id)
+        .where(Application.job_id == drive_id, Application.status == 'shortlisted',
+               ~exists().where(InterviewAssignment.application_id == Application.id))
+        .order_by(Application.applied_at)
+    ).all()
+    
+    return render_template('company_interviews.html', profile=profile, drive=drive, panels=panels,
+                           scheduled=scheduled, unscheduled=unscheduled, now=datetime.now())
+
+@bp.route('/company/drive/<int:drive_id>/interviews/panels', methods=['POST'])
+@company_required
+def add_interview_panel(drive_id):
+    """Add an interview panel to a drive"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    if drive.company_id != profile.id:
+        flash('You do not have permission to manage these interviews.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    name = request.form.get('name', '').strip()
+    if not name or len(name) > 100:
+        flash('Panel name is required and must not exceed 100 characters.', 'danger')
+    else:
+        db.session.add(InterviewPanel(job_id=drive_id, name=name))
+        db.session.commit()
+        flash(f'Panel "{name}" added.', 'success')
+    
+    return redirect(url_for('company.manage_interviews', drive_id=drive_id))
+
+@bp.route('/company/interviews/panel/<int:panel_id>/slots', methods=['POST'])
+@company_required
+def add_interview_slots(panel_id):
+    """Add a block of consecutive interview slots to a panel"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    panel = InterviewPanel.query.get_or_404(panel_id)
+    
+    if panel.job.company_id != profile.id:
+        flash('You do not have permission to manage these interviews.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    try:
+        day = request.form.get('date', '')
+        start = datetime.strptime(f"{day} {request.form.get('start_time', '')}", '%Y-%m-%d %H:%M')
+        end = datetime.strptime(f"{day} {request.form.get('end_time', '')}", '%Y-%m-%d %H:%M')
+        minutes = int(request.form.get('duration', 30))
+        break_minutes = int(request.form.get('break', 0) or 0)
+    except ValueError:
+        flash('Invalid date, time or duration.', 'danger')
+        return redirect(url_for('company.manage_interviews', drive_id=panel.job_id))
+    
+    if start < datetime.now() or not 5 <= minutes <= 480 or not 0 <= break_minutes <= 240:
+        flash('Slots must be in the future, 5 to 480 minutes long, with breaks of at most 240 minutes.', 'danger')
+        return redirect(url_for('company.manage_interviews', drive_id=panel.job_id))
+    
+    times = interviews.generate_slots(start, end, minutes, break_minutes)
+    if not times:
+        flash('No slot fits between the start and end time.', 'warning')
+        return redirect(url_for('company.manage_interviews', drive_id=panel.job_id))
+    try:
+        interviews.add_slots(panel, times)
+    except interviews.SlotClash as e:
+        db.session.rollback()
+        flash(str(e), 'danger')
+        return redirect(url_for('company.manage_interviews', drive_id=panel.job_id))
+    db.session.commit()
+    flash(f'{len(times)} slot(s) added to {panel.name}.', 'success')
+    
+    # Once a schedule exists, fit unscheduled candidates into the new capacity
+    if InterviewAssignment.query.filter_by(job_id=panel.job_id).first():
+        result = interviews.plan_drive(panel.job_id)
+        flash(f'Schedule updated: {result.added} newly scheduled, {result.unscheduled} still unscheduled.', 'info')
+    
+    return redirect(url_for('company.manage_interviews', drive_id=panel.job_id))
+
+@bp.route('/company/interviews/slot/<int:slot_id>/delete', methods=['POST'])
+@company_required
+def delete_interview_slot(slot_id):
+    """Remove an interview slot and re-plan the candidate it held"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    slot = InterviewSlot.query.get_or_404(slot_id)
+    drive_id = slot.job_id
+    
+    if slot.panel.job.company_id != profile.id:
+        flash('You do not have permission to manage these interviews.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    had_candidate = slot.assignment is not None
+    db.session.delete(slot)
+    db.session.commit()
+    flash('Slot removed.', 'success')
+    
+    if had_candidate:
+        result = interviews.plan_drive(drive_id)
+        flash(f'Schedule updated: {result.added} rescheduled, {result.moved} moved, '
+              f'{result.unscheduled} unscheduled.', 'info')
+    
+    return redirect(url_for('company.manage_interviews', drive_id=drive_id))
+
+@bp.route('/company/drive/<int:drive_id>/interviews/schedule', methods=['POST'])
+@company_required
+def schedule_interviews(drive_id):
+    """Assign shortlisted applicants to the drive's interview slots"""
+    profile = CompanyProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    if drive.company_id != profile.id:
+        flash('You do not have permission to manage these interviews.', 'danger')
+        return redirect(url_for('company.company_drives'))
+    
+    result = interviews.plan_drive(drive_id)
+    if result.unscheduled:
+        flash(f'{result.scheduled} candidate(s) scheduled; {result.unscheduled} could not be fitted without '
+              f'clashing with their other interviews. Add more slots to schedule them.', 'warning')
+    else:
+        flash(f'All {result.scheduled} shortlisted candidate(s) scheduled.', 'success')
+    
+    return redirect(url_for('company.manage_interviews', drive_id=drive_id))
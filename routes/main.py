@@ -0,0 +1,162 @@
+"""Public pages, authentication, health probes and the live-update stream"""
+from flask import (Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify,
+                   Response)
+from flask_login import login_user, logout_user, login_required, current_user
+from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import text
+import time
+import tenancy
+import events
+from models import db, User
+from decorators import rate_limit
+
+bp = Blueprint('main', __name__)
+
+@bp.route('/healthz')
+def healthz():
+    """Liveness probe - the worker is up and serving requests"""
+    return jsonify(status='ok', uptime=round(time.time() - current_app.config['STARTED_AT'], 1),
+                   startup_seconds=current_app.config.get('STARTUP_SECONDS'))
+
+@bp.route('/readyz')
+def readyz():
+    """Readiness probe - the database pool can hand out a working connection"""
+    try:
+        db.session.execute(text('SELECT 1'))
+    except Exception as e:
+        current_app.logger.warning('Readiness check failed: %s', e)
+        return jsonify(status='unavailable', database='error'), 503
+    finally:
+        db.session.rollback()
+    return jsonify(status='ok', database='ok', pool=tenancy.tenant_engine(db).pool.status())
+
+@bp.route('/')
+def index():
+    """Home page"""
+    return render_template('index.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+@rate_limit('LOGIN_RATE_LIMIT', 'LOGIN_IP_RATE_LIMIT')
+def login():
+    """Login page and authentication"""
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        remember = request.form.get('remember', False) == 'on'
+        
+        user = User.query.filter_by(username=username).first()
+        
+        if user and check_password_hash(user.password_hash, password):
+            login_user(user, remember=remember)
+            flash(f'Welcome back, {user.username}!', 'success')
+            
+            # Redirect to next page or dashboard
+            next_page = request.args.get('next')
+            if next_page:
+                return redirect(next_page)
+            return redirect(url_for('main.dashboard'))
+        else:
+            flash('Invalid username or password.', 'danger')
+    
+    return render_template('login.html')
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    """Registration page"""
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    
+    if request.method == 'POST':
+        username = request.form.get('username')
+        email = request.form.get('email')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        role = request.form.get('role')
+        
+        # Validation
+        if not all([username, email, password, confirm_password, role]):
+            flash('All fields are required.', 'danger')
+            return render_template('register.html')
+        
+        if password != confirm_password:
+            flash('Passwords do not match.', 'danger')
+            return render_template('register.html')
+        
+        if len(password) < 6:
+            flash('Password must be at least 6 characters long.', 'danger')
+            return render_template('register.html')
+        
+        if role not in ['student', 'company']:
+            flash('Invalid role selected.', 'danger')
+            return render_template('register.html')
+        
+        # Check if username or email already exists
+        if User.query.filter_by(username=username).first():
+            flash('Username already exists.', 'danger')
+            return render_template('register.html')
+        
+        if User.query.filter_by(email=email).first():
+            flash('Email already registered.', 'danger')
+            return render_template('register.html')
+        
+        # Create new user
+        new_user = User(
+            username=username,
+            email=email,
+            password_hash=generate_password_hash(password),
+            role=role
+        )
+        
+        db.session.add(new_user)
+        db.session.commit()
+        
+        flash('Registration successful! Please log in.', 'success')
+        return redirect(url_for('main.login'))
+    
+    return render_template('register.html')
+
+@bp.route('/logout')
+@login_required
+def logout():
+    """Logout functionality"""
+    logout_user()
+    flash('You have been logged out successfully.', 'info')
+    return redirect(url_for('main.index'))
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    """Protected dashboard page"""
+    return render_template('dashboard.html')
+
+@bp.route('/events/stream')
+@login_required
+def event_stream():
+    """Server-sent events with live updates for the current user"""
+    # Each connection pins a worker thread here; asgi.py serves this path without one
+    limit = current_app.config['EVENTS_WSGI_STREAMS']
+    if limit <= 0:
+        return '', 204  # EventSource stops reconnecting; pages keep working without live updates
+    limiter = current_app.extensions['concurrency']
+    key = (tenancy.current_tenant(), 'event_stream')
+    broker = current_app.extensions['events']
+    heartbeat = current_app.config['EVENTS_HEARTBEAT']  # The body runs after the app context is gone
+    channel = events.channel_for(current_user.id, tenancy.current_tenant())
+    
+    def body():
+        # The slot and subscription are taken once the server starts sending the body, so a response
+        # that is closed without being iterated holds neither
+        slot = limiter.try_acquire(key, limit)
+        if slot is None:
+            yield events.format_event('unavailable', {})  # The page closes its EventSource
+            return
+        try:
+            yield from events.stream(broker, channel, heartbeat)
+        finally:
+            slot.release()
+    
+    return Response(body(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
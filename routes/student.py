@@ -0,0 +1,338 @@
+"""Student area: profile, drive browsing, applications, placements and interviews"""
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import current_user
+from sqlalchemy import or_, exists
+from sqlalchemy.orm import contains_eager, joinedload
+from datetime import datetime
+import re
+import ingest
+import policy
+from models import (db, StudentProfile, CompanyProfile, JobPosting, Application, DriveRecommendation,
+                    ArchivedApplication, InterviewPanel, InterviewSlot, InterviewAssignment)
+from decorators import student_required, read_replica, rate_limit, concurrency_limit, too_many_requests
+from replicas import mark_primary_sticky
+
+bp = Blueprint('student', __name__)
+
+@bp.route('/student/profile')
+@student_required
+def student_profile():
+    """Student profile page - student only"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    return render_template('student_profile.html', profile=profile)
+
+@bp.route('/student/dashboard')
+@student_required
+@read_replica
+def student_dashboard():
+    """Student dashboard with statistics"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    
+    if profile:
+        # Get student's applications statistics
+        total_applications = Application.query.filter_by(user_id=current_user.id).count()
+        pending_applications = Application.query.filter_by(user_id=current_user.id, status='pending').count()
+        shortlisted_applications = Application.query.filter_by(user_id=current_user.id, status='shortlisted').count()
+        accepted_applications = Application.query.filter_by(user_id=current_user.id, status='accepted').count()
+        
+        # Get available drives count
+        available_drives = JobPosting.query.filter_by(is_active=True, is_approved=True).filter(
+            JobPosting.deadline >= datetime.now()
+        ).count()
+        
+        stats = {
+            'total_applications': total_applications,
+            'pending_applications': pending_applications,
+            'shortlisted_applications': shortlisted_applications,
+            'accepted_applications': accepted_applications,
+            'available_drives': available_drives
+        }
+    else:
+        stats = {
+            'total_applications': 0,
+            'pending_applications': 0,
+            'shortlisted_applications': 0,
+            'accepted_applications': 0,
+            'available_drives': 0
+        }
+    
+    return render_template('student_dashboard.html', profile=profile, stats=stats)
+
+@bp.route('/student/profile/edit', methods=['GET', 'POST'])
+@student_required
+def edit_student_profile():
+    """Edit student profile"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    
+    if request.method == 'POST':
+        full_name = request.form.get('full_name')
+        roll_number = request.form.get('roll_number')
+        branch = request.form.get('branch')
+        cgpa = request.form.get('cgpa')
+        phone = request.form.get('phone')
+        
+        if not all([full_name, roll_number, branch, cgpa, phone]):
+            flash('All fields are required.', 'danger')
+            return render_template('edit_student_profile.html', profile=profile)
+        
+        # Validate phone number (10 digits)
+        if not re.match(r'^\d{10}$', phone):
+            flash('Phone number must be exactly 10 digits.', 'danger')
+            return render_template('edit_student_profile.html', profile=profile)
+        
+        try:
+            cgpa_float = float(cgpa)
+            if cgpa_float < 0 or cgpa_float > 10:
+                flash('CGPA must be between 0 and 10.', 'danger')
+                return render_template('edit_student_profile.html', profile=profile)
+        except ValueError:
+            flash('Invalid CGPA value.', 'danger')
+            return render_template('edit_student_profile.html', profile=profile)
+        
+        if profile:
+            # Update existing profile
+            profile.full_name = full_name
+            profile.roll_number = roll_number
+            profile.branch = branch
+            profile.cgpa = cgpa_float
+            profile.phone = phone
+        else:
+            # Create new profile
+            profile = StudentProfile(
+                user_id=current_user.id,
+                full_name=full_name,
+                roll_number=roll_number,
+                branch=branch,
+                cgpa=cgpa_float,
+                phone=phone
+            )
+            db.session.add(profile)
+        
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        return redirect(url_for('student.student_dashboard'))
+    
+    return render_template('edit_student_profile.html', profile=profile)
+
+@bp.route('/student/drives')
+@student_required
+@read_replica
+def browse_drives():
+    """Browse available drives with filters"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    
+    # Get filter parameters
+    search = request.args.get('search', '')
+    job_type = request.args.get('job_type', '')
+    location = request.args.get('location', '')
+    
+    # Base query: active, approved drives with deadline not passed, and open to the student under the
+    # offer policy if they are placed
+    open_to_student, placed_seasons = policy.open_drives_clause(current_user.id)
+    query = JobPosting.query.join(CompanyProfile).filter(
+        JobPosting.is_active == True,
+        JobPosting.is_approved == True,
+        JobPosting.deadline >= datetime.now(),
+        open_to_student
+    )
+    
+    # Apply filters
+    if search:
+        query = query.filter(
+            or_(
+                JobPosting.title.ilike(f'%{search}%'),
+                JobPosting.description.ilike(f'%{search}%'),
+                CompanyProfile.company_name.ilike(f'%{search}%')
+            )
+        )
+    
+    if job_type:
+        query = query.filter(JobPosting.job_type == job_type)
+    
+    if location:
+        query = query.filter(JobPosting.location.ilike(f'%{location}%'))
+    
+    drives = query.options(contains_eager(JobPosting.company)).order_by(JobPosting.posted_at.desc()).all()
+    
+    # Get student's applied drive IDs
+    applied_drive_ids = [app.job_id for app in Application.query.filter_by(user_id=current_user.id).all()]
+    
+    return render_template('browse_drives.html', profile=profile, drives=drives, 
+                         applied_drive_ids=applied_drive_ids, search=search, 
+                         job_type=job_type, location=location, placed=bool(placed_seasons))
+
+@bp.route('/student/drives/recommended')
+@student_required
+@read_replica
+def recommended_drives():
+    """Drives ranked for the student by the recommendation batch job"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    
+    # One indexed read: the student's precomputed list, still open to them and not yet applied to
+    open_to_student, _ = policy.open_drives_clause(current_user.id)
+    recommendations = DriveRecommendation.query.filter_by(user_id=current_user.id).join(
+        DriveRecommendation.job
+    ).join(JobPosting.company).filter(
+        JobPosting.is_active == True,
+        JobPosting.is_approved == True,
+        JobPosting.deadline >= datetime.now(),
+        open_to_student,
+        ~exists().where(Application.user_id == current_user.id, Application.job_id == JobPosting.id)
+    ).options(
+        contains_eager(DriveRecommendation.job).contains_eager(JobPosting.company)
+    ).order_by(DriveRecommendation.rank).all()
+    
+    return render_template('recommended_drives.html', profile=profile, recommendations=recommendations)
+
+@bp.route('/student/drive/<int:drive_id>')
+@student_required
+def view_drive_details(drive_id):
+    """View detailed information about a drive"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check if student has already applied
+    existing_application = Application.query.filter_by(
+        user_id=current_user.id,
+        job_id=drive_id
+    ).first()
+    
+    return render_template('drive_details.html', profile=profile, drive=drive, 
+                         existing_application=existing_application)
+
+@bp.route('/student/drive/<int:drive_id>/apply', methods=['GET', 'POST'])
+@student_required
+@rate_limit('APPLY_RATE_LIMIT', 'APPLY_IP_RATE_LIMIT')
+@concurrency_limit('APPLY_MAX_CONCURRENT')
+def apply_to_drive(drive_id):
+    """Apply to a placement drive"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    
+    if not profile:
+        flash('Please complete your profile before applying to drives.', 'warning')
+        return redirect(url_for('student.edit_student_profile'))
+    
+    drive = JobPosting.query.get_or_404(drive_id)
+    
+    # Check if drive is still active and approved
+    if not drive.is_active or not drive.is_approved:
+        flash('This drive is not currently accepting applications.', 'danger')
+        return redirect(url_for('student.browse_drives'))
+    
+    # Check if deadline has passed
+    if drive.deadline < datetime.now():
+        flash('The application deadline for this drive has passed.', 'danger')
+        return redirect(url_for('student.browse_drives'))
+    
+    # Check the offer policy (placed students)
+    if not policy.may_apply(current_user.id, drive):
+        flash('You already hold an offer, and this drive is not open to placed students.', 'warning')
+        return redirect(url_for('student.browse_drives'))
+    
+    # Check if already applied
+    existing_application = Application.query.filter_by(
+        user_id=current_user.id,
+        job_id=drive_id
+    ).first()
+    
+    if existing_application:
+        flash('You have already applied to this drive.', 'warning')
+        return redirect(url_for('student.my_applications'))
+    
+    if request.method == 'POST':
+        cover_letter = request.form.get('cover_letter', '')
+        
+        # Validate cover letter length
+        if len(cover_letter) > 1000:
+            flash('Cover letter must not exceed 1000 characters.', 'danger')
+            return render_template('apply_drive.html', profile=profile, drive=drive)
+        
+        # Committed together with other submissions arriving at the same moment
+        try:
+            result = ingest.submit_application(current_user.id, drive_id, cover_letter)
+        except TimeoutError:
+            return too_many_requests(5, status=503)
+        mark_primary_sticky()  # Written by the ingest thread, not this request's session
+        
+        if result == ingest.CLOSED:
+            flash('This drive is not currently accepting applications.', 'danger')
+            return redirect(url_for('student.browse_drives'))
+        if result == ingest.INELIGIBLE:
+            flash('You already hold an offer, and this drive is not open to placed students.', 'warning')
+            return redirect(url_for('student.browse_drives'))
+        if result == ingest.DUPLICATE:
+            flash('You have already applied to this drive.', 'warning')
+            return redirect(url_for('student.my_applications'))
+        
+        flash('Application submitted successfully!', 'success')
+        return redirect(url_for('student.my_applications'))
+    
+    return render_template('apply_drive.html', profile=profile, drive=drive)
+
+@bp.route('/student/applications')
+@student_required
+@read_replica
+def my_applications():
+    """View all applications"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    applications = Application.query.filter_by(user_id=current_user.id).order_by(
+        Application.applied_at.desc()
+    ).all()
+    
+    return render_template('my_applications.html', profile=profile, applications=applications)
+
+@bp.route('/student/application/<int:application_id>')
+@student_required
+def view_application(application_id):
+    """View detailed application status"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    application = Application.query.get_or_404(application_id)
+    
+    # Verify ownership
+    if application.user_id != current_user.id:
+        flash('You do not have permission to view this application.', 'danger')
+        return redirect(url_for('student.my_applications'))
+    
+    return render_template('application_details.html', profile=profile, application=application)
+
+@bp.route('/student/placement-history')
+@student_required
+@read_replica
+def placement_history():
+    """View placement history (accepted applications)"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    placements = Application.query.filter_by(
+        user_id=current_user.id,
+        status='accepted'
+    ).order_by(Application.applied_at.desc()).all()
+    
+    # Placements from archived seasons are only looked up when asked for
+    include_archived = request.args.get('archived') == '1'
+    archived_placements = []
+    if include_archived:
+        archived_placements = ArchivedApplication.query.filter_by(
+            user_id=current_user.id,
+            status='accepted'
+        ).options(joinedload(ArchivedApplication.job)).order_by(ArchivedApplication.applied_at.desc()).all()
+    
+    return render_template('placement_history.html', profile=profile, placements=placements,
+                         include_archived=include_archived, archived_placements=archived_placements)
+
+@bp.route('/student/interviews')
+@student_required
+@read_replica
+def my_interviews():
+    """Student's scheduled interviews across drives"""
+    profile = StudentProfile.query.filter_by(user_id=current_user.id).first()
+    interviews_list = db.session.execute(
+        db.select(InterviewSlot.starts_at, InterviewSlot.ends_at, InterviewPanel.name.label('panel'),
+                  JobPosting.title, CompanyProfile.company_name, JobPosting.location)
+        .join(InterviewAssignment, InterviewAssignment.slot_id == InterviewSlot.id)
+        .join(InterviewPanel, InterviewSlot.panel_id == InterviewPanel.id)
+        .join(JobPosting, InterviewSlot.job_id == JobPosting.id)
+        .join(CompanyProfile, JobPosting.company_id == CompanyProfile.id)
+        .where(InterviewAssignment.user_id == current_user.id)
+        .order_by(InterviewSlot.starts_at)
+    ).all()
+    
+    return render_template('my_interviews.html', profile=profile, interviews=interviews_list, now=datetime.now())
@@ -0,0 +1,26 @@
+"""Salary parsing shared by the placement analytics and the offer policy.
+
+Kept apart from analytics.py so the offer policy, which runs on every
+student request, doesn't import NumPy.
+"""
+import re
+
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+
+def parse_salary(text):
+    """Best-effort annual salary in lakhs per annum from free text like '12 LPA' or '₹8,00,000'"""
+    if not text:
+        return None
+    lowered = text.lower().replace(',', '')
+    match = NUMBER_PATTERN.search(lowered)
+    if not match:
+        return None
+    value = float(match.group())
+    if 'cr' in lowered:
+        value *= 100
+    elif 'lpa' not in lowered and 'lakh' not in lowered and 'lac' not in lowered and value >= 1000:
+        if 'month' in lowered or '/m' in lowered or 'pm' in lowered.split():
+            value *= 12
+        value /= 100000
+    return value
@@ -151,4 +151,48 @@ document.addEventListener('DOMContentLoaded', function() {
             document.getElementById(`${this.id}_count`).textContent = this.value.length;
         });
     });
+
+    // Live application status and dashboard counters (server-sent events)
+    const eventsUrl = document.body.dataset.eventsUrl;
+    if (eventsUrl && window.EventSource) {
+        const STATUS_BADGES = {
+            pending: ['bg-warning', 'Pending'],
+            reviewed: ['bg-info', 'Reviewed'],
+            shortlisted: ['bg-primary', 'Shortlisted'],
+            rejected: ['bg-danger', 'Rejected'],
+            accepted: ['bg-success', 'Accepted'],
+            withdrawn: ['bg-secondary', 'Withdrawn']
+        };
+        const source = new EventSource(eventsUrl);
+
+        source.addEventListener('status', function(event) {
+            const data = JSON.parse(event.data);
+            const badge = STATUS_BADGES[data.status];
+            if (!badge) {
+                return;
+            }
+            document.querySelectorAll(`[data-application-status="${data.application_id}"]`).forEach(function(cell) {
+                cell.innerHTML = `<span class="badge ${badge[0]}">${badge[1]}</span>`;
+            });
+        });
+
+        source.addEventListener('counts', function(event) {
+            const deltas = JSON.parse(event.data);
+            Object.keys(deltas).forEach(function(key) {
+                document.querySelectorAll(`[data-count="${key}"]`).forEach(function(counter) {
+                    counter.textContent = Math.max(0, (parseInt(counter.textContent, 10) || 0) + deltas[key]);
+                });
+            });
+        });
+
+        // Missed too many updates: start again from fresh server-rendered numbers
+        source.addEventListener('resync', function() {
+            window.location.reload();
+        });
+
+        // The worker has no free stream slot: carry on without live updates
+        source.addEventListener('unavailable', function() {
+            source.close();
+        });
+    }
 });
@@ -0,0 +1,126 @@
+"""Multi-college tenancy.
+
+Each college (tenant) has its own database, configured as
+TENANT_DATABASE_URLS="iitb=sqlite:///iitb.db,nitk=postgresql://.../nitk" and
+registered as a 'tenant:<slug>' bind with its own engine and connection pool.
+Requests are mapped to a tenant by subdomain (iitb.portal.example.com) or by a
+/t/<slug> path prefix, and RoutingSession sends every query of that request
+to the tenant's database. Background jobs and init_db.py commands select a
+tenant with tenant_context().
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import has_request_context, request
+from werkzeug.exceptions import NotFound
+
+TENANT_BIND_PREFIX = 'tenant:'
+TENANT_ENVIRON_KEY = 'portal.tenant'
+PATH_PREFIX = 't'
+EXEMPT_PATHS = ('/healthz', '/readyz')  # Probes answer without a tenant
+
+_tenant = ContextVar('tenant', default=None)
+
+
+def parse_tenants(value):
+    """Parse 'slug=url,slug=url' into an ordered {slug: url} dict"""
+    tenants = {}
+    for entry in value.split(','):
+        if entry.strip():
+            slug, _, uri = entry.partition('=')
+            tenants[slug.strip()] = uri.strip()
+    return tenants
+
+
+def tenant_binds(tenants):
+    """Build SQLALCHEMY_BINDS entries for the tenant databases"""
+    return {f'{TENANT_BIND_PREFIX}{slug}': uri for slug, uri in tenants.items()}
+
+
+def current_tenant():
+    """Slug of the tenant being served, or None in single-tenant mode"""
+    if has_request_context() and TENANT_ENVIRON_KEY in request.environ:
+        return request.environ[TENANT_ENVIRON_KEY]
+    return _tenant.get()
+
+
+@contextmanager
+def tenant_context(slug):
+    """Run background work or CLI commands against one tenant's database"""
+    token = _tenant.set(slug)
+    try:
+        yield slug
+    finally:
+        _tenant.reset(token)
+
+
+def tenant_engine(db, slug=None):
+    """Engine of a tenant (the current one by default), or the primary engine"""
+    slug = slug or current_tenant()
+    return db.engines[f'{TENANT_BIND_PREFIX}{slug}'] if slug else db.engine
+
+
+def create_all(db):
+    """db.create_all() that targets the current tenant's database"""
+    slug = current_tenant()
+    if not slug:
+        return db.create_all()
+    engine = tenant_engine(db, slug)
+    for metadata in db.metadatas.values():
+        metadata.create_all(engine)
+
+
+def cache_key(*parts):
+    """Namespace an in-process cache key by tenant"""
+    return (current_tenant(),) + parts
+
+
+def session_user_id(user_id):
+    """Login session identity, tagged with the tenant the user belongs to"""
+    slug = current_tenant()
+    return f'{slug}:{user_id}' if slug else str(user_id)
+
+
+def load_session_user_id(value):
+    """User id from a login session identity, or None if it belongs to another tenant"""
+    slug, _, user_id = value.rpartition(':')
+    if (slug or None) != current_tenant() or not user_id.isdigit():
+        return None
+    return int(user_id)
+
+
+def resolve(tenants, host, path, default=None):
+    """(slug, path prefix) for a request; the prefix is '' unless the tenant came from the path"""
+    parts = path.split('/', 3)
+    if len(parts) >= 3 and parts[1] == PATH_PREFIX and parts[2] in tenants:
+        return parts[2], f'/{PATH_PREFIX}/{parts[2]}'
+    subdomain = host.split(':')[0].split('.')[0]
+    if subdomain in tenants:
+        return subdomain, ''
+    return default, ''
+
+
+class TenantMiddleware:
+    """Resolves the tenant before Flask sees the request and moves a /t/<slug> prefix into SCRIPT_NAME"""
+
+    def __init__(self, wsgi_app, tenants, default=None):
+        self.wsgi_app = wsgi_app
+        self.tenants = tenants
+        self.default = default
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        slug, prefix = resolve(self.tenants, environ.get('HTTP_HOST', ''), path, self.default)
+        if slug is None and path not in EXEMPT_PATHS:
+            return NotFound('Unknown college.')(environ, start_response)
+        if prefix:
+            environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + prefix
+            environ['PATH_INFO'] = path[len(prefix):] or '/'
+        environ[TENANT_ENVIRON_KEY] = slug
+        return self.wsgi_app(environ, start_response)
+
+
+def init_app(app):
+    """Install tenant resolution when TENANT_DATABASE_URLS is configured"""
+    if app.config['TENANTS']:
+        app.wsgi_app = TenantMiddleware(app.wsgi_app, app.config['TENANTS'], app.config['DEFAULT_TENANT'])
+    app.context_processor(lambda: {'tenant': current_tenant()})
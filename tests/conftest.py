@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+from models import db  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build an app on a fresh SQLite database; keyword arguments override config"""
+    database = f'sqlite:///{tmp_path / "test.db"}'
+
+    def make_app(**overrides):
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = database
+            SQLALCHEMY_BINDS = {'archive': database}
+            TENANTS = {}
+            JINJA_CACHE_DIR = ''
+            RATELIMIT_ENABLED = False
+            INTERVIEW_GAP_MINUTES = 15
+
+        for key, value in overrides.items():
+            setattr(TestConfig, key, value)
+        return create_app(TestConfig)
+    return make_app
+
+
+@pytest.fixture
+def app(make_app):
+    """An app with a fresh SQLite database per test"""
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import time
+
+from flask import Flask
+
+from asgi import PooledWsgiToAsgi
+
+
+def request(app, path='/'):
+    """Run one GET through an ASGI app; returns the status and body"""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': [],
+             'http_version': '1.1'}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    async def call():
+        await app(scope, receive, send)
+        return messages[0]['status'], b''.join(m.get('body', b'') for m in messages[1:])
+    return call()
+
+
+def test_wsgi_fallback_runs_requests_concurrently():
+    flask_app = Flask(__name__)
+    threads = set()
+
+    @flask_app.route('/')
+    def slow():
+        threads.add(threading.get_ident())
+        time.sleep(0.2)
+        return 'ok'
+
+    app = PooledWsgiToAsgi(flask_app, threads=10)
+
+    async def burst():
+        return await asyncio.gather(*(request(app) for _ in range(10)))
+
+    started = time.perf_counter()
+    responses = asyncio.run(burst())
+    elapsed = time.perf_counter() - started
+
+    assert responses == [(200, b'ok')] * 10
+    assert len(threads) == 10
+    assert elapsed < 1  # One after another would take 2s
@@ -0,0 +1,32 @@
+import assets
+
+
+def rebuild(app, static):
+    app.static_folder = str(static)
+    built = assets.build(app.static_folder)
+    manifest = assets.load_manifest(app.static_folder)
+    app.extensions['assets'].update(
+        manifest=manifest, encodings={entry['path']: entry['encodings'] for entry in manifest.values()})
+    return built['css/style.css'][0]
+
+
+def test_assets_from_earlier_builds_are_still_served(app, tmp_path):
+    css = tmp_path / 'static' / 'css' / 'style.css'
+    css.parent.mkdir(parents=True)
+    css.write_text('body { color: black; }\n' * 40)
+    old = rebuild(app, tmp_path / 'static')
+    css.write_text('body { color: navy; }\n' * 40)
+    new = rebuild(app, tmp_path / 'static')
+    assert old != new
+
+    client = app.test_client()
+    for name in (new, old):
+        response = client.get(f'/assets/{name}', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.cache_control.immutable
+    assert client.get(f'/assets/{old}').data == b'body { color: black; }\n' * 40
+
+    assert client.get('/assets/css/style.0000000000.css').status_code == 404
+    assert client.get(f'/assets/{assets.MANIFEST}').status_code == 404
+    assert client.get(f'/assets/{old}.gz').status_code == 404
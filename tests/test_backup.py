@@ -0,0 +1,32 @@
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import make_url
+
+import backup
+import init_db
+from models import db, User
+
+
+def test_backup_of_missing_database_fails(app, tmp_path):
+    missing = tmp_path / 'typo.db'
+    with pytest.raises(backup.BackupError):
+        backup.backup(make_url(f'sqlite:///{missing}'), str(tmp_path / 'out.db.gz'))
+    assert not missing.exists()
+    assert not (tmp_path / 'out.db.gz').exists()
+
+
+def test_backup_and_restore_into_instance_folder(app, tmp_path):
+    db.session.add(User(username='admin', email='admin@example.com', password_hash='x', role='admin'))
+    db.session.commit()
+    db.session.execute(db.text('PRAGMA journal_mode=WAL'))
+    path = str(tmp_path / 'portal.db.gz')
+    backup.backup(db.engine.url, path)
+
+    app.instance_path = str(tmp_path / 'instance')
+    assert init_db.restore_database(app, path, 'sqlite:///restored.db')
+
+    restored = os.path.join(app.instance_path, 'restored.db')
+    with sqlite3.connect(restored) as conn:
+        assert conn.execute('SELECT username FROM users').fetchall() == [('admin',)]
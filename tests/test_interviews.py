@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from werkzeug.security import generate_password_hash
+
+import interviews
+from models import (db, User, CompanyProfile, JobPosting, Application, InterviewPanel, InterviewSlot,
+                    InterviewAssignment)
+
+DAY = (datetime.now() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def at(hour, minute=0):
+    return DAY.replace(hour=hour, minute=minute)
+
+
+@pytest.fixture
+def company(app):
+    user = User(username='acme', email='acme@example.com', password_hash=generate_password_hash('pw1234'),
+                role='company', is_approved=True)
+    db.session.add(user)
+    db.session.flush()
+    profile = CompanyProfile(user_id=user.id, company_name='Acme', industry='Software')
+    db.session.add(profile)
+    db.session.flush()
+    return profile
+
+
+def make_drive(company, title):
+    drive = JobPosting(company_id=company.id, title=title, description='d', requirements='r',
+                       location='Pune', job_type='Full-time', deadline=DAY + timedelta(days=30))
+    db.session.add(drive)
+    db.session.flush()
+    return drive
+
+
+def make_students(count):
+    students = [User(username=f'student{i}', email=f'student{i}@example.com', password_hash='x', role='student')
+                for i in range(count)]
+    db.session.add_all(students)
+    db.session.flush()
+    return students
+
+
+def shortlist(drive, students):
+    """Shortlisted applications in the order given (earliest applicant first)"""
+    applications = [Application(user_id=student.id, job_id=drive.id, status='shortlisted',
+                                applied_at=datetime(2024, 1, 1) + timedelta(minutes=i))
+                    for i, student in enumerate(students)]
+    db.session.add_all(applications)
+    db.session.flush()
+    return applications
+
+
+def add_slots(drive, *times, minutes=30):
+    panel = InterviewPanel(job_id=drive.id, name='Panel 1')
+    db.session.add(panel)
+    db.session.flush()
+    slots = [InterviewSlot(panel_id=panel.id, job_id=drive.id, starts_at=start,
+                           ends_at=start + timedelta(minutes=minutes)) for start in times]
+    db.session.add_all(slots)
+    db.session.commit()
+    return slots
+
+
+def schedule(drive):
+    """{application_id: slot start} of a drive"""
+    return dict(db.session.execute(
+        select(InterviewAssignment.application_id, InterviewSlot.starts_at)
+        .join(InterviewSlot).where(InterviewAssignment.job_id == drive.id)
+    ).all())
+
+
+def test_hopcroft_karp_extends_seed_matching():
+    # Left 0 can only take right 0, which the seed gave to left 1: left 1 moves, nobody is dropped
+    assert interviews.hopcroft_karp([[0], [0, 1]], 2, [interviews.UNMATCHED, 0]) == [0, 1]
+
+
+def test_clash_with_other_drive_within_gap(company):
+    first, second = make_drive(company, 'Backend'), make_drive(company, 'Frontend')
+    (student,) = make_students(1)
+    (first_application,) = shortlist(first, [student])
+    (second_application,) = shortlist(second, [student])
+    add_slots(first, at(10))                 # 10:00-10:30, so busy until 10:45 with the 15 minute gap
+    add_slots(second, at(10, 40))            # Starts inside the gap
+
+    interviews.plan_drive(first.id)
+    result = interviews.plan_drive(second.id)
+    assert schedule(first) == {first_application.id: at(10)}
+    assert (result.scheduled, result.unscheduled) == (0, 1)
+
+    add_slots(second, at(10, 45))            # Starts exactly when the gap ends
+    result = interviews.plan_drive(second.id)
+    assert (result.scheduled, result.unscheduled) == (1, 0)
+    assert schedule(second) == {second_application.id: at(10, 45)}
+
+
+def test_replan_after_slot_deleted_keeps_existing_assignments(company):
+    drive = make_drive(company, 'Backend')
+    applications = shortlist(drive, make_students(3))
+    slots = add_slots(drive, at(9), at(10), at(11), at(12))
+
+    result = interviews.plan_drive(drive.id)
+    assert (result.scheduled, result.added) == (3, 3)
+    before = schedule(drive)
+    assert [before[a.id] for a in applications] == [at(9), at(10), at(11)]  # Earlier applicants, earlier slots
+
+    db.session.execute(delete(InterviewSlot).where(InterviewSlot.id == slots[1].id))
+    db.session.commit()
+    result = interviews.plan_drive(drive.id)
+
+    after = schedule(drive)
+    assert after[applications[0].id] == at(9)
+    assert after[applications[2].id] == at(11)
+    assert after[applications[1].id] == at(12)
+    assert result == interviews.PlanResult(scheduled=3, added=1, moved=0, dropped=0, unscheduled=0)
+
+
+def test_more_candidates_than_slots(company):
+    drive = make_drive(company, 'Backend')
+    applications = shortlist(drive, make_students(5))
+    add_slots(drive, at(9), at(10), at(11))
+
+    result = interviews.plan_drive(drive.id)
+
+    assert (result.scheduled, result.unscheduled) == (3, 2)
+    assert set(schedule(drive)) == {a.id for a in applications[:3]}
+
+
+def test_plan_drives_gives_tightest_drive_first_pick(company):
+    tight, roomy = make_drive(company, 'Backend'), make_drive(company, 'Frontend')
+    (student,) = make_students(1)
+    (tight_application,) = shortlist(tight, [student])
+    (roomy_application,) = shortlist(roomy, [student])
+    add_slots(tight, at(10))                 # One slot for one candidate: no slack
+    add_slots(roomy, at(10), at(12))         # A spare slot
+
+    results = interviews.plan_drives([roomy.id, tight.id])
+
+    assert schedule(tight) == {tight_application.id: at(10)}
+    assert schedule(roomy) == {roomy_application.id: at(12)}
+    assert results[tight.id].unscheduled == results[roomy.id].unscheduled == 0
+
+
+@pytest.mark.parametrize('status', ['rejected', 'reviewed'])
+def test_leaving_shortlist_frees_upcoming_slot(app, company, status):
+    drive = make_drive(company, 'Backend')
+    applications = shortlist(drive, make_students(2))
+    add_slots(drive, at(9))
+    interviews.plan_drive(drive.id)
+    assert set(schedule(drive)) == {applications[0].id}
+
+    client = app.test_client()
+    client.post('/login', data={'username': 'acme', 'password': 'pw1234'})
+    client.post(f'/company/application/{applications[0].id}/update-status', data={'status': status})
+
+    assert schedule(drive) == {}
+    result = interviews.plan_drive(drive.id)  # The freed slot goes to the next candidate
+    assert schedule(drive) == {applications[1].id: at(9)}
+    assert (result.scheduled, result.unscheduled) == (1, 0)
+
+
+def test_release_keeps_past_interviews(company):
+    drive = make_drive(company, 'Backend')
+    (application,) = shortlist(drive, make_students(1))
+    (slot,) = add_slots(drive, at(9))
+    interviews.plan_drive(drive.id)
+    slot.starts_at, slot.ends_at = at(9) - timedelta(days=2), at(9, 30) - timedelta(days=2)
+    db.session.commit()
+
+    assert interviews.release_slots([application.id]) == 0
+    assert set(schedule(drive)) == {application.id}
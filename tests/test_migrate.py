@@ -0,0 +1,63 @@
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import init_db
+from models import db, User, CompanyProfile, JobPosting, Application
+
+
+@pytest.fixture
+def duplicates(app, tmp_path):
+    """An applications table from before the unique (user_id, job_id) constraint, holding duplicates"""
+    company_user = User(username='acme', email='acme@example.com', password_hash='x', role='company')
+    students = [User(username=f'student{i}', email=f'student{i}@example.com', password_hash='x', role='student')
+                for i in range(2)]
+    db.session.add_all([company_user, *students])
+    db.session.flush()
+    company = CompanyProfile(user_id=company_user.id, company_name='Acme', industry='Software')
+    db.session.add(company)
+    db.session.flush()
+    drive = JobPosting(company_id=company.id, title='Backend', description='d', requirements='r', location='Pune',
+                       job_type='Full-time', deadline=datetime.now() + timedelta(days=30))
+    db.session.add(drive)
+    db.session.commit()
+    drive_id = drive.id
+    rows = [(1, students[0].id, 'pending'), (2, students[0].id, 'accepted'), (3, students[0].id, 'rejected'),
+            (4, students[1].id, 'pending')]
+    db.session.remove()
+
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('PRAGMA foreign_keys=OFF')
+        conn.exec_driver_sql('CREATE TABLE applications__plain AS SELECT * FROM applications')
+        conn.exec_driver_sql('DROP TABLE applications')
+        conn.exec_driver_sql('ALTER TABLE applications__plain RENAME TO applications')
+        conn.exec_driver_sql('INSERT INTO applications (id, user_id, job_id, status) VALUES '
+                             + ', '.join(f"({i}, {user_id}, {drive_id}, '{status}')" for i, user_id, status in rows))
+        conn.commit()
+    app.instance_path = str(tmp_path)
+    return drive_id
+
+
+def ids():
+    return {application.id for application in Application.query.all()}
+
+
+def test_duplicates_are_only_reported_by_default(app, duplicates):
+    assert not init_db.migrate_database(app)
+    assert ids() == {1, 2, 3, 4}
+
+
+def test_drop_duplicates_keeps_the_furthest_along_and_saves_the_rest(app, tmp_path, duplicates):
+    assert init_db.migrate_database(app, drop_duplicates=True)
+    assert ids() == {2, 4}  # The accepted application is kept
+
+    (saved,) = tmp_path.glob('portal-dropped-applications-*.csv')
+    with open(saved, newline='') as f:
+        assert sorted(int(row['id']) for row in csv.DictReader(f)) == [1, 3]
+
+    db.session.add(Application(user_id=db.session.get(Application, 2).user_id, job_id=duplicates))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
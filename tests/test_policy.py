@@ -0,0 +1,79 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+import ingest
+import policy
+from models import db, current_season, season_for, User, CompanyProfile, JobPosting, Application
+
+CURRENT = current_season()
+PREVIOUS = season_for(datetime.utcnow() - timedelta(days=366))
+
+
+@pytest.fixture
+def drives(app):
+    """A student placed in the previous season, and open drives on both sides of the season boundary"""
+    student = User(username='student', email='student@example.com', role='student',
+                   password_hash=generate_password_hash('pw1234'))
+    db.session.add(student)
+    companies = {}
+    for name, dream in (('Acme', False), ('Dreamco', True)):
+        user = User(username=name.lower(), email=f'{name.lower()}@example.com', password_hash='x', role='company')
+        db.session.add(user)
+        db.session.flush()
+        companies[name] = CompanyProfile(user_id=user.id, company_name=name, industry='Software', is_dream=dream)
+        db.session.add(companies[name])
+    db.session.flush()
+
+    def drive(title, company, season):
+        posting = JobPosting(company_id=companies[company].id, title=title, description='d', requirements='r',
+                             location='Pune', job_type='Full-time', deadline=datetime.now() + timedelta(days=30),
+                             season=season, is_active=True, is_approved=True)
+        db.session.add(posting)
+        db.session.flush()
+        return posting
+
+    offer = drive('Offer', 'Acme', PREVIOUS)
+    db.session.add(Application(user_id=student.id, job_id=offer.id, status='accepted'))
+    postings = {
+        'previous': drive('Previous season', 'Acme', PREVIOUS),
+        'previous dream': drive('Previous season, dream company', 'Dreamco', PREVIOUS),
+        'current': drive('Current season', 'Acme', CURRENT),
+    }
+    db.session.commit()
+    return student, postings
+
+
+def test_each_drive_is_judged_in_its_own_season(drives):
+    student, postings = drives
+    expected = {'previous': False, 'previous dream': True, 'current': True}
+    assert {key: policy.may_apply(student.id, drive) for key, drive in postings.items()} == expected
+
+    results = ingest.write_batch([ingest.Submission(student.id, drive.id, '') for drive in postings.values()])
+    assert dict(zip(postings, results)) == {'previous': ingest.INELIGIBLE, 'previous dream': ingest.CREATED,
+                                            'current': ingest.CREATED}
+
+
+def test_listing_matches_may_apply(app, drives):
+    student, postings = drives
+    client = app.test_client()
+    client.post('/login', data={'username': 'student', 'password': 'pw1234'})
+    page = client.get('/student/drives').get_data(as_text=True)
+    listed = set(re.findall(r'<h5 class="card-title">(.*?)</h5>', page))
+    assert listed == {'Previous season, dream company', 'Current season'}
+    assert 'You have accepted an offer' in page
+
+
+def test_higher_salary_tier_stays_open(app, drives):
+    student, postings = drives
+    app.config['OFFER_SALARY_TIERS'] = [10.0]
+    JobPosting.query.filter_by(title='Offer').one().salary = '8 LPA'
+    postings['previous'].salary = '12 LPA'
+    db.session.commit()
+
+    clause, seasons = policy.open_drives_clause(student.id)
+    listed = {drive.title for drive in JobPosting.query.join(CompanyProfile).filter(clause)}
+    assert seasons == {PREVIOUS}
+    assert 'Previous season' in listed and policy.may_apply(student.id, postings['previous'])
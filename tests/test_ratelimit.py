@@ -0,0 +1,40 @@
+import pytest
+
+from models import db
+from ratelimit import MemoryBackend
+
+
+@pytest.fixture
+def client(make_app):
+    app = make_app(RATELIMIT_ENABLED=True, LOGIN_RATE_LIMIT='10/minute', LOGIN_IP_RATE_LIMIT='30/minute',
+                   PROXY_FIX_X_FOR=1)
+    with app.app_context():
+        db.create_all()
+    return app.test_client()
+
+
+def login(client, username, ip='10.0.0.1'):
+    return client.post('/login', data={'username': username, 'password': 'wrong'},
+                       headers={'X-Forwarded-For': ip}).status_code
+
+
+def test_users_behind_one_address_have_their_own_buckets(client):
+    assert [login(client, f'student{i}') for i in range(12)] == [200] * 12
+
+
+def test_user_bucket_limits_one_username(client):
+    assert [login(client, 'student0') for _ in range(11)] == [200] * 10 + [429]
+
+
+def test_address_bucket_has_its_own_limit(client):
+    statuses = [login(client, f'student{i}') for i in range(31)]
+    assert statuses == [200] * 30 + [429]
+    assert login(client, 'student99', ip='10.0.0.2') == 200  # Taken from X-Forwarded-For
+
+
+def test_rejected_request_takes_no_tokens():
+    backend = MemoryBackend()
+    user, ip = ('user', 0.001, 1), ('ip', 0.001, 2)
+    assert backend.consume([user, ip]) == (True, 0)
+    assert backend.consume([user, ip])[0] is False  # The user bucket is empty...
+    assert backend.consume([('other', 0.001, 1), ip]) == (True, 0)  # ...so the address still has a token